@@ -0,0 +1,132 @@
+"""
+Benchmark de l'OCR sur un corpus synthétique de CV scannés
+
+Usage:
+    python -m benchmarks.bench_ocr --documents 20 --pages 2
+
+Chaque document est un PDF composé uniquement d'images (pas de couche texte),
+généré à partir d'un CV fictif rendu puis bruité/pivoté pour simuler un scan.
+Le corpus est traité deux fois : à froid (OCR réel) puis à chaud (cache).
+
+Objectifs de débit (configurables) :
+    - à froid : >= 1.5 page/s par worker OCR (OCR_DPI=200)
+    - à chaud : >= 25 pages/s (rendu + empreinte uniquement)
+"""
+import argparse
+import io
+import random
+import statistics
+import time
+from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from src.Configs.OCR_config import OCR_MAX_WORKERS, OCR_DPI
+from src.Services.OCRService import OCRService
+from src.Services.FileExtractionService import FileExtractionService
+
+
+FIRST_NAMES = ["Jean", "Marie", "Hery", "Fanja", "Paul", "Sophie", "Rado", "Claire"]
+LAST_NAMES = ["Rakoto", "Martin", "Randria", "Dupont", "Rasoa", "Bernard"]
+TITLES = ["Développeur Full Stack", "Data Analyst", "Chef de projet", "Comptable", "Ingénieur DevOps"]
+SKILLS = ["Python", "React", "Node.js", "SQL", "Docker", "Excel", "Gestion de projet", "Anglais courant"]
+COMPANIES = ["TechCorp", "Orange", "BNI", "Telma", "Capgemini", "Axian"]
+
+
+def _font(size: int):
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def _cv_lines(rng: random.Random) -> list:
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        rng.choice(TITLES),
+        "",
+        "EXPÉRIENCE PROFESSIONNELLE",
+    ]
+    year = rng.randint(2010, 2018)
+    for _ in range(rng.randint(2, 4)):
+        end = year + rng.randint(1, 3)
+        lines.append(f"{year} - {end} : {rng.choice(TITLES)} chez {rng.choice(COMPANIES)}")
+        lines.append("Conception et maintenance d'applications, encadrement d'une équipe.")
+        year = end
+    lines += ["", "FORMATION", f"Master Informatique - Université d'Antananarivo ({year - 8})", ""]
+    lines += ["COMPÉTENCES", ", ".join(rng.sample(SKILLS, 5))]
+    return lines
+
+
+def _scanned_page(rng: random.Random, dpi: int = 150) -> Image.Image:
+    width, height = int(8.27 * dpi), int(11.69 * dpi)
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    font = _font(int(dpi / 6))
+    y = dpi // 2
+    for line in _cv_lines(rng):
+        draw.text((dpi // 2, y), line, fill=rng.randint(0, 60), font=font)
+        y += int(dpi / 4)
+    # Bruit de numérisation : légère rotation, flou et grains
+    image = image.rotate(rng.uniform(-1.5, 1.5), fillcolor=255).filter(ImageFilter.GaussianBlur(0.6))
+    pixels = image.load()
+    for _ in range(width * height // 400):
+        pixels[rng.randrange(width), rng.randrange(height)] = rng.randint(0, 255)
+    return image
+
+
+def build_corpus(documents: int, pages: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(documents):
+        images = [_scanned_page(rng) for _ in range(pages)]
+        buffer = io.BytesIO()
+        images[0].save(buffer, "PDF", save_all=True, append_images=images[1:], resolution=150)
+        corpus.append(buffer.getvalue())
+    return corpus
+
+
+def run(corpus: list) -> tuple:
+    latencies = []
+    started = time.perf_counter()
+    for document in corpus:
+        t0 = time.perf_counter()
+        FileExtractionService.extract_text_from_pdf(document)
+        latencies.append(time.perf_counter() - t0)
+    return time.perf_counter() - started, latencies
+
+
+def report(label: str, pages: int, elapsed: float, latencies: list, target: float):
+    throughput = pages / elapsed
+    p95 = sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)]
+    status = "OK" if throughput >= target else "SOUS L'OBJECTIF"
+    print(
+        f"{label:<6} {throughput:8.2f} pages/s (objectif {target:.2f}) "
+        f"| doc p50 {statistics.median(latencies) * 1000:7.1f} ms p95 {p95 * 1000:7.1f} ms | {status}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR sur CV scannés synthétiques")
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--cold-target", type=float, default=1.5 * OCR_MAX_WORKERS)
+    parser.add_argument("--warm-target", type=float, default=25.0)
+    args = parser.parse_args()
+
+    if not OCRService.is_available():
+        print("OCR indisponible (OCR_ENABLED, pypdfium2, pytesseract ou tesseract manquant)")
+        return
+
+    corpus = build_corpus(args.documents, args.pages)
+    total_pages = args.documents * args.pages
+    print(f"{args.documents} documents, {total_pages} pages, {OCR_MAX_WORKERS} workers, {OCR_DPI} DPI")
+
+    try:
+        elapsed, latencies = run(corpus)
+        report("froid", total_pages, elapsed, latencies, args.cold_target)
+        elapsed, latencies = run(corpus)
+        report("chaud", total_pages, elapsed, latencies, args.warm_target)
+    finally:
+        OCRService.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Traitement en masse de CVs hors ligne (import de l'historique d'un client)
+
+Usage:
+    python cli.py ./cvs -o resultats.jsonl
+    python cli.py historique.zip -o resultats.jsonl --parquet resultats.parquet
+    python cli.py ./cvs -o resultats.jsonl --analyze --job-description poste.txt --rate 0.5
+
+Chaque document (dossier parcouru récursivement, archives ZIP comprises) produit une
+ligne JSON : texte extrait, type détecté, profil structuré et, avec --analyze,
+l'analyse du modèle. Une exécution interrompue reprend sans retraiter les documents
+déjà écrits (point de reprise `<sortie>.checkpoint`).
+"""
+import argparse
+import asyncio
+import os
+import sys
+from src.Configs.Extraction_config import EXTRACTION_WORKERS, BULK_ANALYSIS_RATE, BULK_ANALYSIS_CONCURRENCY
+from src.Services.BulkImportService import BulkImportService
+from src.Services.OCRService import OCRService
+from src.Services.UsageLedger import UsageLedger
+from src.Utils.BaseError import BaseError
+from src.Utils.RequestContext import caller_var, feature_var
+
+
+def _print_progress(report: dict):
+    print(
+        f"  {report['processed']} documents ({report['failed']} en échec), "
+        f"{report['documents_per_s']} docs/s",
+        file=sys.stderr,
+    )
+
+
+def _print_report(report: dict):
+    print(
+        f"\n{report['processed']} documents traités en {report['wall_s']}s "
+        f"({report['documents_per_s']} docs/s, {report['mb_per_s']} MB/s sur {report['input_mb']} MB)"
+    )
+    print(
+        f"  réussis: {report['succeeded']}, en échec: {report['failed']}, "
+        f"déjà traités (reprise): {report['skipped']}"
+    )
+    if report["analyzed"] or report["analysis_failed"]:
+        print(f"  analyses: {report['analyzed']}, analyses en échec: {report['analysis_failed']}")
+    print("\n  étape      documents   total (s)   moyenne (ms)   p95 (ms)")
+    for stage, timing in report["stages"].items():
+        print(
+            f"  {stage:<10} {timing['count']:>9}   {timing['total_s']:>9}   "
+            f"{timing['mean_ms']:>12}   {timing['p95_ms']:>8}"
+        )
+
+
+async def _run(args) -> dict:
+    job_description = None
+    if args.job_description:
+        with open(args.job_description, encoding="utf-8") as file:
+            job_description = file.read()
+
+    caller_var.set("cli")
+    feature_var.set("bulk-import")
+    if args.analyze:
+        await UsageLedger.start()
+    try:
+        return await BulkImportService.run(
+            args.input,
+            args.output,
+            checkpoint_path=args.checkpoint,
+            workers=args.workers,
+            with_profile=not args.no_profile,
+            analyze=args.analyze,
+            job_description=job_description,
+            compact=args.compact,
+            analysis_rate=args.rate,
+            analysis_concurrency=args.concurrency,
+            progress=_print_progress,
+        )
+    finally:
+        if args.analyze:
+            await UsageLedger.stop()
+        OCRService.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction (et analyse) en masse de CVs avec reprise")
+    parser.add_argument("input", help="Dossier, archive ZIP ou fichier à traiter")
+    parser.add_argument("-o", "--output", required=True, help="Fichier JSONL de résultats (complété à la reprise)")
+    parser.add_argument("--parquet", help="Exporter aussi les résultats en Parquet (nécessite pyarrow)")
+    parser.add_argument("--checkpoint", help="Fichier de reprise (défaut: <sortie>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=EXTRACTION_WORKERS, help="Processus d'extraction")
+    parser.add_argument("--no-profile", action="store_true", help="Ne pas extraire le profil structuré")
+    parser.add_argument("--analyze", action="store_true", help="Analyser chaque CV avec le modèle")
+    parser.add_argument("--job-description", help="Fichier texte de la description de poste pour l'analyse")
+    parser.add_argument("--compact", action="store_true", help="Prompt d'analyse compact (profil et sections utiles)")
+    parser.add_argument("--rate", type=float, default=BULK_ANALYSIS_RATE, help="Analyses par seconde (0 = illimité)")
+    parser.add_argument("--concurrency", type=int, default=BULK_ANALYSIS_CONCURRENCY, help="Analyses simultanées")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        parser.error(f"introuvable: {args.input}")
+    if args.parquet:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("--parquet nécessite pyarrow (pip install pyarrow)")
+
+    try:
+        report = asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        print("\nInterrompu : relancer la même commande pour reprendre.", file=sys.stderr)
+        sys.exit(130)
+
+    _print_report(report)
+    if args.parquet:
+        try:
+            rows = BulkImportService.write_parquet(args.output, args.parquet)
+            print(f"\n{rows} lignes exportées vers {args.parquet}")
+        except BaseError as e:
+            print(e.message, file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,33 @@
-from fastapi import FastAPI, Request, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from src.Routes.index import router
 from src.Middlewares.CORS import setup_cors
+from src.Middlewares.Compression import setup_compression
+from src.Middlewares.RequestContext import setup_request_context
+from src.Middlewares.Deadline import setup_deadline
+from src.Middlewares.UploadLimit import setup_upload_limit
+from src.Middlewares.InternalAuth import setup_internal_auth
+from src.Middlewares.Admission import setup_admission, AdmissionController
 from src.Configs.OpenRouter_config import FREE_MODELS
-import os
+from src.Services.ExtractionPool import ExtractionPool
+from src.Services.OCRService import OCRService
+from src.Services.UsageLedger import UsageLedger
+from src.Services.SpeculativeAnalysis import SpeculativeAnalysis
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await UsageLedger.start()
+    await AdmissionController.start()
+    yield
+    await AdmissionController.stop()
+    SpeculativeAnalysis.shutdown()
+    await UsageLedger.stop()
+    # Arrêt des pools de processus (extraction, OCR)
+    ExtractionPool.shutdown()
+    OCRService.shutdown()
+
 
 app = FastAPI(
     title="Recrutement IA Service",
@@ -24,6 +49,8 @@ app = FastAPI(
     * openai/gpt-oss-120b:free
     """,
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
     contact={
         "name": "Support IA",
         "email": "support-ia@recrutement.com",
@@ -47,19 +74,26 @@ app = FastAPI(
 # Configuration CORS
 setup_cors(app)
 
+# Compression des réponses (brotli/gzip)
+setup_compression(app)
+
+# Contexte de requête (appelant, fonctionnalité) pour la comptabilité des appels
+setup_request_context(app)
+
+# Taille des envois de fichiers bornée avant l'analyse multipart
+setup_upload_limit(app)
+
+# Échéance par requête et annulation en cas de déconnexion du client
+setup_deadline(app)
+
 # Inclusion des routes
 app.include_router(router)
 
-INTERNAL_TOKEN = os.getenv("AI_INTERNAL_TOKEN")
+# Seul le backend principal est autorisé à appeler les routes IA
+setup_internal_auth(app)
 
-@app.middleware("http")
-async def verify_internal_token(request: Request, call_next):
-    # Seul le backend principal est autorisé à appeler les routes IA
-    if request.url.path.startswith("/ai"):
-        header_token = request.headers.get("x-internal-token")
-        if not INTERNAL_TOKEN or header_token != INTERNAL_TOKEN:
-            raise HTTPException(status_code=401, detail="Accès IA non autorisé")
-    return await call_next(request)
+# Contrôle d'admission (ajouté en dernier : s'exécute avant tout autre middleware)
+setup_admission(app)
 
 
 @app.get(
@@ -83,14 +117,37 @@ async def root():
 @app.get(
     "/health",
     summary="Santé du service",
-    description="Vérifie que le service est opérationnel",
+    description="""
+    Vérifie que le service est opérationnel et retourne l'état du contrôle d'admission.
+
+    `status` vaut `overloaded` lorsque de nouvelles requêtes sont refusées (503 avec
+    `Retry-After`) : boucle d'événements en retard, route à sa limite de requêtes
+    simultanées ou file du pool d'extraction pleine. Cette route n'est jamais refusée.
+    """,
     tags=["Service"],
     responses={
         200: {
             "description": "Service opérationnel",
             "content": {
                 "application/json": {
-                    "example": {"status": "healthy"}
+                    "example": {
+                        "status": "healthy",
+                        "admission": {
+                            "enabled": True,
+                            "overloaded": False,
+                            "loop_lag_ms": 0.4,
+                            "max_loop_lag_ms": 12.3,
+                            "in_flight": {"/ai/chat": 3},
+                            "saturated_routes": [],
+                            "extraction_queue": 0,
+                            "ocr_queue": 0,
+                            "admitted": 1520,
+                            "shed_in_flight": 0,
+                            "shed_loop_lag": 0,
+                            "shed_extraction_queue": 0,
+                            "shed_ocr_queue": 0
+                        }
+                    }
                 }
             }
         }
@@ -100,7 +157,8 @@ async def health():
     """
     Endpoint de santé pour vérifier que le service est opérationnel
     """
-    return {"status": "healthy"}
+    admission = AdmissionController.state()
+    return {"status": "overloaded" if admission["overloaded"] else "healthy", "admission": admission}
 
 
 @app.get(
@@ -1,3 +1,5 @@
+import os
+
 # Système de protection pour restreindre le domaine de l'IA
 PROTECTIVE_SYSTEM_PROMPT = (
     "Tu es l'assistant IA de la plateforme 'Recrutement', un réseau social professionnel "
@@ -9,3 +11,23 @@ PROTECTIVE_SYSTEM_PROMPT = (
     "culture générale, programmation non liée au recrutement, etc.), tu dois poliment décliner "
     "en expliquant que tu es spécialisé uniquement dans le domaine du recrutement."
 )
+
+# Pré-filtre local des demandes hors domaine (évite un appel au modèle pour un simple refus)
+DOMAIN_FILTER_ENABLED = os.getenv("DOMAIN_FILTER_ENABLED", "true").lower() == "true"
+# Score minimal (termes hors domaine pondérés, moins les termes du recrutement) pour refuser localement
+DOMAIN_FILTER_THRESHOLD = float(os.getenv("DOMAIN_FILTER_THRESHOLD", "2"))
+
+DOMAIN_REFUSAL_MESSAGE = (
+    "Je suis l'assistant de la plateforme 'Recrutement' et je suis spécialisé uniquement dans "
+    "le domaine du recrutement : recherche d'emploi, rédaction de CV et de lettres de motivation, "
+    "préparation aux entretiens et utilisation de la plateforme. Je ne peux donc pas vous aider "
+    "sur ce sujet, mais n'hésitez pas à me poser une question liée à votre carrière !"
+)
+
+# Analyse spéculative : /ai/extract-text peut lancer l'analyse du CV dès l'extraction,
+# /ai/analyze-cv réutilise ensuite le résultat en cours ou terminé pour le même texte
+SPECULATIVE_ANALYSIS_ENABLED = os.getenv("SPECULATIVE_ANALYSIS_ENABLED", "true").lower() == "true"
+SPECULATIVE_TTL_SECONDS = float(os.getenv("SPECULATIVE_TTL_SECONDS", "600"))
+SPECULATIVE_MAX_ENTRIES = int(os.getenv("SPECULATIVE_MAX_ENTRIES", "200"))
+# Au-delà, aucune nouvelle analyse spéculative n'est lancée (l'analyse se fera à la demande)
+SPECULATIVE_MAX_IN_FLIGHT = int(os.getenv("SPECULATIVE_MAX_IN_FLIGHT", "10"))
@@ -0,0 +1,40 @@
+import os
+from dotenv import load_dotenv
+from src.Configs.Extraction_config import EXTRACTION_WORKERS
+from src.Configs.OCR_config import OCR_MAX_WORKERS
+
+load_dotenv()
+
+# Contrôle d'admission : refus rapide (503 + Retry-After) plutôt que des requêtes qui expirent ensemble
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+
+# Requêtes simultanées admises par route (les autres routes partagent la limite par défaut)
+ROUTE_MAX_IN_FLIGHT = {
+    "/ai/chat": int(os.getenv("CHAT_MAX_IN_FLIGHT", "64")),
+    "/ai/analyze-cv": int(os.getenv("ANALYZE_CV_MAX_IN_FLIGHT", "32")),
+    "/ai/generate-job-description": int(os.getenv("GENERATE_MAX_IN_FLIGHT", "32")),
+    "/ai/extract-text": int(os.getenv("EXTRACT_TEXT_MAX_IN_FLIGHT", "16")),
+    "/ai/extract-text/batch": int(os.getenv("EXTRACT_BATCH_MAX_IN_FLIGHT", "4")),
+}
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("DEFAULT_MAX_IN_FLIGHT", "128"))
+
+# Retard de la boucle d'événements (moyenne glissante) au-delà duquel les nouvelles requêtes sont refusées
+MAX_LOOP_LAG_MS = float(os.getenv("ADMISSION_MAX_LOOP_LAG_MS", "200"))
+LOOP_LAG_SAMPLE_INTERVAL = float(os.getenv("ADMISSION_LAG_SAMPLE_INTERVAL", "0.1"))
+LOOP_LAG_ALPHA = 0.3
+
+# Extractions en attente ou en cours (pool de processus et fichiers uniques) au-delà desquelles
+# les extractions sont refusées
+MAX_EXTRACTION_QUEUE = int(os.getenv("ADMISSION_MAX_EXTRACTION_QUEUE", str(EXTRACTION_WORKERS * 4)))
+EXTRACTION_ROUTES = ("/ai/extract-text", "/ai/extract-text/batch")
+
+# Pages en attente dans le pool OCR au-delà desquelles les extractions de fichier unique sont refusées
+# (les lots font leur OCR dans les workers d'extraction, sans ce pool)
+MAX_OCR_QUEUE = int(os.getenv("ADMISSION_MAX_OCR_QUEUE", str(OCR_MAX_WORKERS * 8)))
+OCR_ROUTES = ("/ai/extract-text",)
+
+# Routes jamais refusées (sondes, documentation, administration)
+EXEMPT_PATHS = ("/", "/health", "/models", "/docs", "/redoc", "/openapi.json")
+EXEMPT_PREFIXES = ("/ai/admin",)
+
+RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "2"))
@@ -0,0 +1,26 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# En-tête par lequel l'appelant (backend Express) transmet son délai, en millisecondes
+DEADLINE_HEADER = "x-request-timeout-ms"
+
+# Délai par défaut d'une requête et plafond accepté depuis l'en-tête (ms)
+DEFAULT_TIMEOUT_MS = int(os.getenv("REQUEST_TIMEOUT_MS", "30000"))
+MAX_TIMEOUT_MS = int(os.getenv("REQUEST_MAX_TIMEOUT_MS", "300000"))
+
+# Délais par défaut par route (ms) ; None : pas de délai sauf en-tête explicite (flux NDJSON)
+ROUTE_TIMEOUTS_MS = {
+    "/ai/chat": int(os.getenv("CHAT_TIMEOUT_MS", "45000")),
+    "/ai/analyze-cv": int(os.getenv("ANALYZE_CV_TIMEOUT_MS", "60000")),
+    "/ai/generate-job-description": int(os.getenv("GENERATE_TIMEOUT_MS", "60000")),
+    "/ai/extract-text": int(os.getenv("EXTRACT_TEXT_TIMEOUT_MS", "60000")),
+    "/ai/extract-text/batch": None,
+}
+
+# Délai d'un appel fournisseur hors requête HTTP (CLI, tâches de fond)
+PROVIDER_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_TIMEOUT_SECONDS", "30"))
+
+# Budget minimal restant pour tenter le modèle de secours OpenRouter après un échec OpenAI
+MIN_FALLBACK_BUDGET_SECONDS = float(os.getenv("MIN_FALLBACK_BUDGET_SECONDS", "5"))
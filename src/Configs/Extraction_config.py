@@ -0,0 +1,21 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Limites de taille des fichiers envoyés pour extraction
+MAX_FILE_SIZE = int(os.getenv("EXTRACTION_MAX_FILE_SIZE", str(10 * 1024 * 1024)))  # 10MB
+MAX_BATCH_SIZE = int(os.getenv("EXTRACTION_MAX_BATCH_SIZE", str(50 * 1024 * 1024)))  # 50MB cumulés
+MAX_BATCH_FILES = int(os.getenv("EXTRACTION_MAX_BATCH_FILES", "20"))
+# Marge pour l'enveloppe multipart (en-têtes des parties, champs de formulaire) dans la limite du corps
+MAX_UPLOAD_OVERHEAD = int(os.getenv("EXTRACTION_MAX_UPLOAD_OVERHEAD", str(1024 * 1024)))
+
+# Taille des blocs lus sur les fichiers reçus (limites par fichier contrôlées au fil de la lecture)
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Pool de processus pour l'extraction en lot (par défaut : un worker par cœur)
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 2)))
+
+# Import en masse (cli.py) : analyses par seconde et analyses simultanées vers les modèles
+BULK_ANALYSIS_RATE = float(os.getenv("BULK_ANALYSIS_RATE", "0.5"))
+BULK_ANALYSIS_CONCURRENCY = int(os.getenv("BULK_ANALYSIS_CONCURRENCY", "2"))
@@ -0,0 +1,31 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Profil des modèles : fenêtre de contexte (tokens) et niveau de qualité (plus haut = meilleur)
+MODEL_PROFILES = {
+    "qwen/qwen3-coder:free": {"context_window": 262144, "tier": 2},
+    "qwen/qwen3-235b-a22b:free": {"context_window": 40960, "tier": 3},
+    "nousresearch/hermes-3-llama-3.1-405b:free": {"context_window": 131072, "tier": 3},
+    "openai/gpt-oss-120b:free": {"context_window": 131072, "tier": 2},
+    "gpt-4o-mini": {"context_window": 128000, "tier": 3},
+}
+DEFAULT_PROFILE = {"context_window": 32768, "tier": 1}
+
+# Au-delà de ce nombre de tokens estimés, on privilégie les modèles de meilleure qualité
+LONG_PROMPT_TOKENS = int(os.getenv("ROUTER_LONG_PROMPT_TOKENS", "2000"))
+
+# En deçà, un petit modèle rapide suffit : les modèles du plus petit niveau passent en premier
+SHORT_PROMPT_TOKENS = int(os.getenv("ROUTER_SHORT_PROMPT_TOKENS", "200"))
+
+# Estimation grossière de la taille d'un prompt (caractères par token)
+CHARS_PER_TOKEN = 4
+
+# Statistiques glissantes (moyenne exponentielle) et valeur a priori pour un modèle jamais appelé
+STATS_ALPHA = float(os.getenv("ROUTER_STATS_ALPHA", "0.2"))
+PRIOR_MS_PER_TOKEN = float(os.getenv("ROUTER_PRIOR_MS_PER_TOKEN", "40"))
+
+# Mise à l'écart temporaire d'un modèle après des échecs consécutifs
+FAILURES_BEFORE_COOLDOWN = int(os.getenv("ROUTER_FAILURES_BEFORE_COOLDOWN", "3"))
+COOLDOWN_SECONDS = float(os.getenv("ROUTER_COOLDOWN_SECONDS", "60"))
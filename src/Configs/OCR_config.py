@@ -0,0 +1,24 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Configuration de l'OCR (pages PDF sans couche texte, ex: CV scannés)
+OCR_ENABLED = os.getenv("OCR_ENABLED", "true").lower() == "true"
+OCR_LANG = os.getenv("OCR_LANG", "fra+eng")
+
+# Pool de processus dédié, borné pour garder le CPU sous contrôle
+OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# Délai maximal (secondes) accordé à Tesseract pour une page
+OCR_PAGE_TIMEOUT = float(os.getenv("OCR_PAGE_TIMEOUT", "20"))
+
+# Rendu des pages : résolution puis réduction si l'image reste trop grande
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+OCR_MAX_DIMENSION = int(os.getenv("OCR_MAX_DIMENSION", "2500"))
+
+# Nombre maximal de pages passées à l'OCR par document
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "10"))
+
+# Nombre de pages conservées dans le cache (clé : empreinte de la page rendue)
+OCR_CACHE_SIZE = int(os.getenv("OCR_CACHE_SIZE", "256"))
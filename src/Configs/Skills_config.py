@@ -0,0 +1,147 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Extraction du profil structuré renvoyée avec le texte par /ai/extract-text
+PROFILE_EXTRACTION_ENABLED = os.getenv("PROFILE_EXTRACTION_ENABLED", "true").lower() == "true"
+
+# Prompt compact d'analyse de CV : longueur maximale conservée par section
+COMPACT_SECTION_MAX_CHARS = int(os.getenv("COMPACT_SECTION_MAX_CHARS", "1500"))
+
+# Dictionnaire des compétences reconnues localement dans les CVs
+# catégorie -> {nom canonique: [variantes]} (variantes comparées en minuscules, sans accents)
+SKILLS = {
+    "langages": {
+        "Python": ["python"],
+        "JavaScript": ["javascript", "js", "ecmascript"],
+        "TypeScript": ["typescript"],
+        "Java": ["java"],
+        "C++": ["c++", "cpp"],
+        "C#": ["c#", "csharp"],
+        "PHP": ["php"],
+        "Go": ["golang"],
+        "Rust": ["rust"],
+        "Ruby": ["ruby"],
+        "Kotlin": ["kotlin"],
+        "Swift": ["swift"],
+        "Dart": ["dart"],
+        "Scala": ["scala"],
+        "SQL": ["sql"],
+        "HTML": ["html", "html5"],
+        "CSS": ["css", "css3", "sass", "scss"],
+        "Bash": ["bash", "shell"],
+    },
+    "frameworks": {
+        "React": ["react", "reactjs", "react.js"],
+        "React Native": ["react native"],
+        "Angular": ["angular", "angularjs"],
+        "Vue.js": ["vue", "vuejs", "vue.js"],
+        "Next.js": ["next.js", "nextjs"],
+        "Node.js": ["node", "nodejs", "node.js"],
+        "Express": ["express", "express.js", "expressjs"],
+        "NestJS": ["nestjs", "nest.js"],
+        "Django": ["django"],
+        "Flask": ["flask"],
+        "FastAPI": ["fastapi"],
+        "Spring": ["spring", "spring boot", "springboot"],
+        "Laravel": ["laravel"],
+        "Symfony": ["symfony"],
+        ".NET": [".net", "dotnet", "asp.net"],
+        "Flutter": ["flutter"],
+        "Tailwind CSS": ["tailwind", "tailwindcss"],
+        "Bootstrap": ["bootstrap"],
+    },
+    "données": {
+        "PostgreSQL": ["postgresql", "postgres"],
+        "MySQL": ["mysql"],
+        "MongoDB": ["mongodb", "mongo"],
+        "Redis": ["redis"],
+        "Elasticsearch": ["elasticsearch"],
+        "Oracle": ["oracle"],
+        "Pandas": ["pandas"],
+        "NumPy": ["numpy"],
+        "Power BI": ["power bi", "powerbi"],
+        "Tableau": ["tableau software"],
+        "Excel": ["excel"],
+        "Machine Learning": ["machine learning", "apprentissage automatique"],
+        "Deep Learning": ["deep learning", "apprentissage profond"],
+        "TensorFlow": ["tensorflow"],
+        "PyTorch": ["pytorch"],
+        "Scikit-learn": ["scikit-learn", "sklearn"],
+        "Spark": ["spark", "pyspark"],
+        "ETL": ["etl"],
+    },
+    "devops": {
+        "Docker": ["docker"],
+        "Kubernetes": ["kubernetes", "k8s"],
+        "Git": ["git", "github", "gitlab"],
+        "CI/CD": ["ci/cd", "integration continue", "jenkins", "github actions", "gitlab ci"],
+        "AWS": ["aws", "amazon web services"],
+        "Azure": ["azure"],
+        "GCP": ["gcp", "google cloud"],
+        "Linux": ["linux", "ubuntu", "debian"],
+        "Terraform": ["terraform"],
+        "Ansible": ["ansible"],
+        "Nginx": ["nginx"],
+    },
+    "méthodes": {
+        "Agile": ["agile", "agilite"],
+        "Scrum": ["scrum"],
+        "Kanban": ["kanban"],
+        "Gestion de projet": ["gestion de projet", "project management", "chef de projet"],
+        "UML": ["uml"],
+        "API REST": ["api rest", "rest api", "restful"],
+        "GraphQL": ["graphql"],
+        "Tests unitaires": ["tests unitaires", "unit testing", "tdd"],
+        "Microservices": ["microservices", "micro-services"],
+    },
+    "bureautique et gestion": {
+        "Word": ["word", "microsoft word"],
+        "PowerPoint": ["powerpoint"],
+        "SAP": ["sap"],
+        "Sage": ["sage"],
+        "Comptabilité": ["comptabilite", "accounting"],
+        "Marketing digital": ["marketing digital", "digital marketing"],
+        "SEO": ["seo", "referencement naturel"],
+        "Photoshop": ["photoshop"],
+        "Figma": ["figma"],
+        "Service client": ["service client", "relation client", "customer service"],
+        "Vente": ["vente", "commercial", "sales"],
+        "Ressources humaines": ["ressources humaines", "gestion rh"],
+    },
+    "langues": {
+        "Français": ["francais", "french"],
+        "Anglais": ["anglais", "english", "toeic", "toefl", "ielts"],
+        "Malgache": ["malgache", "malagasy"],
+        "Espagnol": ["espagnol", "spanish"],
+        "Allemand": ["allemand", "german"],
+        "Italien": ["italien", "italian"],
+        "Chinois": ["chinois", "mandarin", "chinese"],
+        "Arabe": ["arabe", "arabic"],
+    },
+    "savoir-être": {
+        "Leadership": ["leadership"],
+        "Travail en équipe": ["travail en equipe", "esprit d'equipe", "teamwork"],
+        "Communication": ["communication"],
+        "Autonomie": ["autonomie", "autonome"],
+        "Rigueur": ["rigueur", "rigoureux", "rigoureuse"],
+        "Résolution de problèmes": ["resolution de problemes", "problem solving"],
+    },
+}
+
+# Titres de sections reconnus (début de ligne, texte normalisé)
+SECTION_HEADINGS = {
+    "summary": ["profil", "a propos", "resume", "summary", "objectif", "about me"],
+    "experience": [
+        "experience", "experiences", "parcours professionnel", "emplois", "work experience",
+        "professional experience", "employment",
+    ],
+    "education": ["formation", "formations", "education", "diplome", "diplomes", "etudes", "cursus", "parcours academique"],
+    "skills": ["competence", "competences", "skills", "savoir-faire", "outils", "technologies", "expertise"],
+    "languages": ["langues", "languages"],
+    "certifications": ["certification", "certifications", "certificats"],
+    "projects": ["projets", "projects", "realisations"],
+    "interests": ["centres d'interet", "loisirs", "interets", "hobbies", "interests", "activites extra"],
+    "references": ["references"],
+}
@@ -0,0 +1,15 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Registre local de consommation des modèles (tokens, latence, coût par appelant)
+USAGE_LEDGER_ENABLED = os.getenv("USAGE_LEDGER_ENABLED", "true").lower() == "true"
+USAGE_LEDGER_PATH = os.getenv("USAGE_LEDGER_PATH", "usage_ledger.sqlite3")
+
+# Écritures groupées : au plus USAGE_BATCH_SIZE lignes, au moins toutes les USAGE_FLUSH_INTERVAL secondes
+USAGE_BATCH_SIZE = int(os.getenv("USAGE_BATCH_SIZE", "200"))
+USAGE_FLUSH_INTERVAL = float(os.getenv("USAGE_FLUSH_INTERVAL", "2"))
+
+# Au-delà, les enregistrements sont abandonnés plutôt que de ralentir les requêtes
+USAGE_QUEUE_MAX = int(os.getenv("USAGE_QUEUE_MAX", "10000"))
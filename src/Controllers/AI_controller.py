@@ -1,12 +1,21 @@
+from typing import AsyncIterator, List, Optional
+import orjson
 from fastapi import HTTPException, UploadFile
 from src.Services.OpenRouterService import OpenRouterService
 from src.Services.FileExtractionService import FileExtractionService
+from src.Services.BatchExtractionService import BatchExtractionService
+from src.Services.ExtractionPool import ExtractionPool
+from src.Services.DomainFilter import DomainFilter
+from src.Services.SpeculativeAnalysis import SpeculativeAnalysis
+from src.Services.ProfileExtractionService import ProfileExtractionService
+from src.Configs.Skills_config import PROFILE_EXTRACTION_ENABLED
 from src.Utils.Interface.IModels import (
     ChatRequest,
     ChatResponse,
     AnalyzeCVRequest,
     GenerateJobDescriptionRequest,
-    ExtractTextResponse
+    ExtractTextResponse,
+    CandidateProfile
 )
 from src.Utils.BaseError import BaseError
 import os
@@ -19,8 +28,10 @@ class AIController:
         Endpoint pour les conversations avec l'IA via OpenRouter
         """
         try:
-            result = await OpenRouterService.chat(request)
-            return ChatResponse(**result)
+            # Demande clairement hors domaine : refus local, sans appel au modèle
+            result = DomainFilter.screen(request) or await OpenRouterService.chat(request)
+            # Résultat produit par nos services : pas de revalidation
+            return ChatResponse.model_construct(**result)
         except BaseError as e:
             raise HTTPException(status_code=e.status_code, detail=e.message)
         except Exception as e:
@@ -32,11 +43,18 @@ class AIController:
         Analyse un CV et le compare avec une description de poste
         """
         try:
-            result = await OpenRouterService.analyze_cv(
+            # Analyse déjà lancée à l'extraction du même texte : on s'y rattache
+            result = await SpeculativeAnalysis.attach(
                 request.cv_text,
-                request.job_description
+                request.job_description,
+                request.compact,
+                request.analysis_handle
+            ) or await OpenRouterService.analyze_cv(
+                request.cv_text,
+                request.job_description,
+                request.compact
             )
-            return ChatResponse(**result)
+            return ChatResponse.model_construct(**result)
         except BaseError as e:
             raise HTTPException(status_code=e.status_code, detail=e.message)
         except Exception as e:
@@ -54,22 +72,30 @@ class AIController:
                 request.requirements,
                 request.skills
             )
-            return ChatResponse(**result)
+            return ChatResponse.model_construct(**result)
         except BaseError as e:
             raise HTTPException(status_code=e.status_code, detail=e.message)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
     @staticmethod
-    async def extract_text(file: UploadFile) -> ExtractTextResponse:
+    async def extract_text(
+        file: UploadFile,
+        with_profile: bool = True,
+        speculate: bool = False,
+        job_description: Optional[str] = None,
+        compact: bool = False
+    ) -> ExtractTextResponse:
         """
-        Extrait le texte d'un fichier (PDF, DOCX, TXT)
+        Extrait le texte d'un fichier (PDF, DOCX, DOC, ODT, RTF, HTML, TXT)
+        et, si demandé, le profil structuré du CV
+
+        Avec `speculate`, l'analyse du CV démarre aussitôt en tâche de fond ; l'appel
+        suivant à analyze_cv pour le même texte réutilise son résultat.
         """
         try:
-            # Vérifier le type de fichier
+            # L'extension n'est qu'indicative : le type est déterminé par le contenu
             file_extension = os.path.splitext(file.filename)[1] if file.filename else ''
-            if not file_extension:
-                raise BaseError("Impossible de déterminer le type de fichier", 400)
             
             # Lire le contenu du fichier
             file_content = await file.read()
@@ -79,17 +105,52 @@ class AIController:
             if len(file_content) > max_size:
                 raise BaseError("Le fichier est trop volumineux (max 10MB)", 400)
             
-            # Extraire le texte
-            text = FileExtractionService.extract_text_from_file(file_content, file_extension)
+            # Extraire le texte (hors boucle d'événements : parsing et OCR sont bloquants)
+            # Attente bornée par l'échéance de la requête (504 au-delà), comptée par le contrôle d'admission
+            text, file_type, profile = await ExtractionPool.run_in_thread(
+                AIController._extract_with_profile, file_content, file_extension,
+                with_profile and PROFILE_EXTRACTION_ENABLED
+            )
+
+            handle = SpeculativeAnalysis.start(text, job_description, compact) if speculate else None
             
-            return ExtractTextResponse(
+            return ExtractTextResponse.model_construct(
                 text=text,
                 file_name=file.filename or "unknown",
-                file_type=file_extension.lstrip('.'),
-                character_count=len(text)
+                file_type=file_type,
+                character_count=len(text),
+                profile=CandidateProfile.model_validate(profile) if profile else None,
+                analysis_handle=handle
             )
         except BaseError as e:
             raise HTTPException(status_code=e.status_code, detail=e.message)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Erreur lors de l'extraction: {str(e)}")
 
+    @staticmethod
+    def _extract_with_profile(content: bytes, ext: str, with_profile: bool):
+        # Extraction et profil dans le même passage hors boucle d'événements
+        text, file_type = FileExtractionService.extract_document(content, ext)
+        profile = ProfileExtractionService.extract_profile(text) if with_profile else None
+        return text, file_type, profile
+
+    @staticmethod
+    async def extract_text_batch(files: List[UploadFile]) -> AsyncIterator[bytes]:
+        """
+        Extrait le texte de plusieurs fichiers (ou d'une archive ZIP) en parallèle.
+        Retourne un flux NDJSON : une ligne par fichier, dans l'ordre de fin de traitement.
+        """
+        try:
+            documents, rejected = await BatchExtractionService.read_batch(files)
+        except BaseError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Erreur lors de la lecture des fichiers: {str(e)}")
+
+        async def stream():
+            for item in rejected:
+                yield orjson.dumps(item) + b"\n"
+            async for item in BatchExtractionService.extract_batch(documents):
+                yield orjson.dumps(item) + b"\n"
+
+        return stream()
@@ -0,0 +1,55 @@
+from typing import Optional
+from fastapi import HTTPException
+from src.Services.UsageLedger import UsageLedger, GROUP_BY_COLUMNS
+from src.Services.ModelRouter import ModelRouter
+from src.Services.DomainFilter import DomainFilter
+from src.Services.SpeculativeAnalysis import SpeculativeAnalysis
+from src.Utils.Interface.IModels import UsageSummaryResponse, UsageSummaryItem
+from src.Utils.BaseError import BaseError
+
+
+class AdminController:
+    @staticmethod
+    async def usage_summary(group_by: str, since: Optional[float], until: Optional[float]) -> UsageSummaryResponse:
+        """
+        Agrège la consommation des modèles enregistrée dans le registre local
+        """
+        try:
+            if group_by not in GROUP_BY_COLUMNS:
+                raise BaseError(
+                    f"Axe de regroupement invalide: {group_by}. Valeurs acceptées: {', '.join(GROUP_BY_COLUMNS)}",
+                    400
+                )
+            rows = await UsageLedger.summary(group_by, since, until)
+            return UsageSummaryResponse.model_construct(
+                group_by=group_by,
+                since=since,
+                until=until,
+                items=[UsageSummaryItem.model_construct(**row) for row in rows],
+                ledger=UsageLedger.stats(),
+            )
+        except BaseError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.message)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    async def model_stats() -> dict:
+        """
+        Statistiques glissantes du routeur de modèles (latence, débit, erreurs)
+        """
+        return {"models": ModelRouter.stats()}
+
+    @staticmethod
+    async def domain_filter_stats() -> dict:
+        """
+        Compteurs du pré-filtre local des demandes hors domaine
+        """
+        return DomainFilter.stats()
+
+    @staticmethod
+    async def speculative_analysis_stats() -> dict:
+        """
+        Compteurs de l'analyse de CV lancée dès l'extraction
+        """
+        return SpeculativeAnalysis.stats()
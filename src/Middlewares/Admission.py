@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from src.Configs.Admission_config import (
+    ADMISSION_ENABLED,
+    ROUTE_MAX_IN_FLIGHT,
+    DEFAULT_MAX_IN_FLIGHT,
+    MAX_LOOP_LAG_MS,
+    LOOP_LAG_SAMPLE_INTERVAL,
+    LOOP_LAG_ALPHA,
+    MAX_EXTRACTION_QUEUE,
+    EXTRACTION_ROUTES,
+    MAX_OCR_QUEUE,
+    OCR_ROUTES,
+    EXEMPT_PATHS,
+    EXEMPT_PREFIXES,
+    RETRY_AFTER_SECONDS,
+)
+from src.Services.ExtractionPool import ExtractionPool
+from src.Services.OCRService import OCRService
+
+OVERLOAD_MESSAGE = "Service surchargé, veuillez réessayer dans quelques instants"
+
+
+class AdmissionController:
+    """
+    État du contrôle d'admission : requêtes en cours par route, retard de la boucle
+    d'événements (mesuré par une tâche de fond), extractions en cours et file du pool OCR
+    """
+    _in_flight: Dict[str, int] = {}
+    _loop_lag_ms = 0.0
+    _max_loop_lag_ms = 0.0
+    _monitor: Optional[asyncio.Task] = None
+    _metrics = {
+        "admitted": 0,
+        "shed_in_flight": 0,
+        "shed_loop_lag": 0,
+        "shed_extraction_queue": 0,
+        "shed_ocr_queue": 0,
+    }
+
+    @staticmethod
+    async def start():
+        """
+        Démarre la mesure du retard de la boucle d'événements (appelé au démarrage de l'application)
+        """
+        if ADMISSION_ENABLED and AdmissionController._monitor is None:
+            AdmissionController._monitor = asyncio.create_task(AdmissionController._monitor_loop())
+
+    @staticmethod
+    async def stop():
+        monitor = AdmissionController._monitor
+        AdmissionController._monitor = None
+        if monitor is not None:
+            monitor.cancel()
+            try:
+                await monitor
+            except asyncio.CancelledError:
+                pass
+
+    @staticmethod
+    async def _monitor_loop():
+        # Le réveil tardif d'un sommeil de durée connue mesure le temps passé par la boucle sur d'autres tâches
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(LOOP_LAG_SAMPLE_INTERVAL)
+            lag_ms = max(0.0, (time.monotonic() - started - LOOP_LAG_SAMPLE_INTERVAL) * 1000)
+            previous = AdmissionController._loop_lag_ms
+            AdmissionController._loop_lag_ms = previous + LOOP_LAG_ALPHA * (lag_ms - previous)
+            AdmissionController._max_loop_lag_ms = max(AdmissionController._max_loop_lag_ms, lag_ms)
+
+    @staticmethod
+    def is_exempt(path: str) -> bool:
+        return path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES)
+
+    @staticmethod
+    def route_key(path: str) -> str:
+        # Les chemins sans limite propre partagent un compteur (pas de croissance avec des URLs arbitraires)
+        return path if path in ROUTE_MAX_IN_FLIGHT else "*"
+
+    @staticmethod
+    def limit_for(route: str) -> int:
+        return ROUTE_MAX_IN_FLIGHT.get(route, DEFAULT_MAX_IN_FLIGHT)
+
+    @staticmethod
+    def check(route: str) -> Optional[str]:
+        """
+        Raison du refus d'une nouvelle requête sur `route`, ou None si elle est admise
+        """
+        if AdmissionController._in_flight.get(route, 0) >= AdmissionController.limit_for(route):
+            return "in_flight"
+        if AdmissionController._loop_lag_ms > MAX_LOOP_LAG_MS:
+            return "loop_lag"
+        if route in EXTRACTION_ROUTES and ExtractionPool.pending() >= MAX_EXTRACTION_QUEUE:
+            return "extraction_queue"
+        if route in OCR_ROUTES and OCRService.pending() >= MAX_OCR_QUEUE:
+            return "ocr_queue"
+        return None
+
+    @staticmethod
+    def acquire(route: str):
+        AdmissionController._in_flight[route] = AdmissionController._in_flight.get(route, 0) + 1
+        AdmissionController._metrics["admitted"] += 1
+
+    @staticmethod
+    def release(route: str):
+        AdmissionController._in_flight[route] -= 1
+
+    @staticmethod
+    def record_shed(reason: str):
+        AdmissionController._metrics[f"shed_{reason}"] += 1
+
+    @staticmethod
+    def state() -> dict:
+        """
+        État courant (exposé par /health)
+        """
+        in_flight = {path: count for path, count in AdmissionController._in_flight.items() if count}
+        saturated = [path for path, count in in_flight.items() if count >= AdmissionController.limit_for(path)]
+        overloaded = AdmissionController._loop_lag_ms > MAX_LOOP_LAG_MS or bool(saturated) \
+            or ExtractionPool.pending() >= MAX_EXTRACTION_QUEUE or OCRService.pending() >= MAX_OCR_QUEUE
+        return {
+            "enabled": ADMISSION_ENABLED,
+            "overloaded": ADMISSION_ENABLED and overloaded,
+            "loop_lag_ms": round(AdmissionController._loop_lag_ms, 1),
+            "max_loop_lag_ms": round(AdmissionController._max_loop_lag_ms, 1),
+            "in_flight": in_flight,
+            "saturated_routes": saturated,
+            "extraction_queue": ExtractionPool.pending(),
+            "ocr_queue": OCRService.pending(),
+            **AdmissionController._metrics,
+        }
+
+
+class AdmissionMiddleware:
+    """
+    Refuse immédiatement (503 + Retry-After) les requêtes que le service ne peut pas
+    servir à temps : route à sa limite de requêtes simultanées, boucle d'événements en
+    retard, ou file d'extraction (pool de processus, fichiers uniques, OCR) pleine. Les sondes (/health...) ne sont jamais refusées.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not ADMISSION_ENABLED or AdmissionController.is_exempt(path):
+            return await self.app(scope, receive, send)
+
+        route = AdmissionController.route_key(path)
+        reason = AdmissionController.check(route)
+        if reason is not None:
+            AdmissionController.record_shed(reason)
+            logging.warning(f"Requête refusée ({reason}): {path}")
+            response = ORJSONResponse(
+                {"detail": OVERLOAD_MESSAGE, "reason": reason},
+                status_code=503,
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+            return await response(scope, receive, send)
+
+        AdmissionController.acquire(route)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            AdmissionController.release(route)
+
+
+def setup_admission(app: FastAPI):
+    """
+    Configure le contrôle d'admission (à ajouter en dernier pour qu'il s'exécute en premier)
+    """
+    app.add_middleware(AdmissionMiddleware)
@@ -0,0 +1,44 @@
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+import os
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # brotli-asgi est optionnel : repli sur gzip seul
+    BrotliMiddleware = None
+
+# Réponses en flux (NDJSON) : chaque ligne doit partir dès qu'elle est prête
+STREAMING_PATHS = ("/ai/extract-text/batch",)
+
+
+class CompressionMiddleware:
+    """
+    Compression brotli ou gzip selon Accept-Encoding
+
+    Les réponses en flux ne sont compressées qu'en brotli, qui vide son tampon à chaque
+    bloc : gzip les retiendrait jusqu'à la fin et le client recevrait toutes les lignes
+    d'un coup. Sans brotli, elles partent non compressées.
+    """
+    def __init__(self, app, minimum_size: int):
+        self.app = app
+        if BrotliMiddleware is not None:
+            # Négocie br, puis gzip si le client ne supporte pas brotli
+            self.compressed = BrotliMiddleware(app, quality=4, minimum_size=minimum_size, gzip_fallback=True)
+        else:
+            self.compressed = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in STREAMING_PATHS:
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            if BrotliMiddleware is None or "br" not in accept_encoding:
+                return await self.app(scope, receive, send)
+        await self.compressed(scope, receive, send)
+
+
+def setup_compression(app: FastAPI):
+    """
+    Configure la compression des réponses (brotli ou gzip selon Accept-Encoding)
+    """
+    minimum_size = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
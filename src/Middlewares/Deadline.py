@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from src.Configs.Deadline_config import DEADLINE_HEADER, DEFAULT_TIMEOUT_MS, MAX_TIMEOUT_MS, ROUTE_TIMEOUTS_MS
+from src.Utils.Deadline import deadline_var, DEADLINE_MESSAGE
+
+
+def _timeout_ms(scope) -> Optional[int]:
+    # En-tête invalide, nul ou négatif : défaut de la route
+    header = dict(scope["headers"]).get(DEADLINE_HEADER.encode())
+    if header:
+        try:
+            value = int(header)
+        except ValueError:
+            value = 0
+        if value > 0:
+            return min(value, MAX_TIMEOUT_MS)
+    return ROUTE_TIMEOUTS_MS.get(scope["path"], DEFAULT_TIMEOUT_MS)
+
+
+class DeadlineMiddleware:
+    """
+    Échéance par requête (en-tête `x-request-timeout-ms`, sinon défaut de la route) et
+    annulation du traitement si le client se déconnecte
+
+    L'échéance est exposée aux services par `deadline_var` (délais des appels aux modèles
+    et des extractions). Une fois le corps de la requête lu, le middleware écoute seul le
+    canal `receive` : une déconnexion du client annule le traitement en cours, ce qui
+    interrompt aussi les appels sortants vers les fournisseurs. À l'échéance, le traitement
+    est annulé et une réponse 504 est envoyée si aucune réponse n'a commencé.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timeout_ms = _timeout_ms(scope)
+        body_received = asyncio.Event()
+        disconnected = asyncio.Event()
+        response_started = False
+        response_complete = False
+        timed_out = False
+
+        async def receive_wrapper():
+            if body_received.is_set():
+                # Corps déjà transmis : seule une déconnexion peut encore arriver
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+            elif not message.get("more_body", False):
+                body_received.set()
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_started, response_complete
+            if timed_out:
+                # Échéance dépassée : une réponse tardive de l'application n'est jamais transmise
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        async def watch_disconnect():
+            await body_received.wait()
+            while True:
+                if (await receive())["type"] == "http.disconnect":
+                    # Après l'envoi complet de la réponse, la fin de connexion n'est pas une annulation
+                    if not response_complete:
+                        disconnected.set()
+                    return
+
+        token = deadline_var.set(time.monotonic() + timeout_ms / 1000 if timeout_ms is not None else None)
+        try:
+            app_task = asyncio.ensure_future(self.app(scope, receive_wrapper, send_wrapper))
+        finally:
+            deadline_var.reset(token)
+        watcher = asyncio.ensure_future(watch_disconnect())
+        waiter = asyncio.ensure_future(disconnected.wait())
+
+        try:
+            done, _ = await asyncio.wait(
+                {app_task, waiter},
+                timeout=timeout_ms / 1000 if timeout_ms is not None else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if app_task not in done and response_complete:
+                # Réponse déjà envoyée (tâches d'arrière-plan) : pas d'annulation
+                await app_task
+                done = {app_task}
+            if app_task not in done and not disconnected.is_set():
+                # Échéance : les envois de l'application sont coupés avant l'annulation, pour
+                # qu'un traitement qui ignore l'annulation ne puisse pas répondre après le 504
+                timed_out = True
+                logging.warning(f"Échéance de {timeout_ms} ms dépassée: {scope['path']}")
+                if not response_started:
+                    response = ORJSONResponse({"detail": DEADLINE_MESSAGE}, status_code=504)
+                    await response(scope, receive, send)
+        finally:
+            watcher.cancel()
+            waiter.cancel()
+            if not app_task.done():
+                app_task.cancel()
+                try:
+                    await app_task
+                except asyncio.CancelledError:
+                    pass
+                except Exception:
+                    if not timed_out:
+                        raise
+
+        if app_task in done:
+            # Propage une éventuelle exception du traitement
+            return app_task.result()
+
+        if disconnected.is_set():
+            logging.info(f"Client déconnecté, traitement annulé: {scope['path']}")
+
+
+def setup_deadline(app: FastAPI):
+    """
+    Configure le middleware d'échéance et d'annulation des requêtes
+    """
+    app.add_middleware(DeadlineMiddleware)
@@ -0,0 +1,31 @@
+import os
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+INTERNAL_TOKEN = os.getenv("AI_INTERNAL_TOKEN")
+
+
+class InternalAuthMiddleware:
+    """
+    Réserve les routes IA (`/ai`) au backend principal (en-tête `x-internal-token`)
+
+    Middleware ASGI pur : il n'attend pas de réponse de l'application, une requête
+    annulée sans réponse (déconnexion du client) ne produit donc pas d'erreur 500.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/ai"):
+            header_token = dict(scope["headers"]).get(b"x-internal-token")
+            if not INTERNAL_TOKEN or header_token is None or header_token.decode("latin-1") != INTERNAL_TOKEN:
+                response = ORJSONResponse({"detail": "Accès IA non autorisé"}, status_code=401)
+                return await response(scope, receive, send)
+        await self.app(scope, receive, send)
+
+
+def setup_internal_auth(app: FastAPI):
+    """
+    Configure le middleware d'authentification des appels internes
+    """
+    app.add_middleware(InternalAuthMiddleware)
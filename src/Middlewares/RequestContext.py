@@ -0,0 +1,33 @@
+from fastapi import FastAPI
+from src.Utils.RequestContext import caller_var, feature_var
+
+
+class RequestContextMiddleware:
+    """
+    Associe à chaque requête l'appelant (en-tête `x-caller-id`) et la fonctionnalité
+    (en-tête `x-feature`, sinon le chemin de la route)
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        caller = headers.get(b"x-caller-id")
+        feature = headers.get(b"x-feature")
+        caller_token = caller_var.set(caller.decode("latin-1") if caller else None)
+        feature_token = feature_var.set(feature.decode("latin-1") if feature else scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            caller_var.reset(caller_token)
+            feature_var.reset(feature_token)
+
+
+def setup_request_context(app: FastAPI):
+    """
+    Configure le middleware de contexte de requête
+    """
+    app.add_middleware(RequestContextMiddleware)
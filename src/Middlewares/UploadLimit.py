@@ -0,0 +1,73 @@
+from typing import Dict, Optional
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from src.Configs.Extraction_config import MAX_FILE_SIZE, MAX_BATCH_SIZE, MAX_UPLOAD_OVERHEAD
+
+# Taille maximale du corps des requêtes d'envoi de fichiers (fichiers et enveloppe multipart)
+UPLOAD_LIMITS = {
+    "/ai/extract-text": MAX_FILE_SIZE + MAX_UPLOAD_OVERHEAD,
+    "/ai/extract-text/batch": MAX_BATCH_SIZE + MAX_UPLOAD_OVERHEAD,
+}
+
+
+class UploadLimitMiddleware:
+    """
+    Refuse (413) les envois de fichiers trop volumineux avant l'analyse multipart
+
+    Starlette reçoit tout le corps (mis sur disque au-delà d'un seuil) avant que la
+    route ne s'exécute : les limites vérifiées par les services arriveraient trop tard.
+    Un `Content-Length` au-delà de la limite est refusé sans rien lire ; sans en-tête
+    (envoi par blocs), la lecture est interrompue dès que la limite est franchie.
+    """
+    def __init__(self, app, limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.limits = UPLOAD_LIMITS if limits is None else limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        too_large = ORJSONResponse(
+            {"detail": f"La requête est trop volumineuse (max {limit // (1024 * 1024)}MB)"},
+            status_code=413,
+        )
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            return await too_large(scope, receive, send)
+
+        received = 0
+        exceeded = False
+
+        async def receive_wrapper():
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Le reste du corps n'est pas lu : l'analyse s'arrête comme sur une déconnexion
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def send_wrapper(message):
+            # La réponse d'erreur de l'application (corps interrompu) est remplacée par le 413
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded:
+            await too_large(scope, receive, send)
+
+
+def setup_upload_limit(app: FastAPI):
+    """
+    Configure la limite de taille des envois de fichiers
+    """
+    app.add_middleware(UploadLimitMiddleware)
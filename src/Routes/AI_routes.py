@@ -1,5 +1,8 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from typing import List, Literal, Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
 from src.Controllers.AI_controller import AIController
+from src.Utils.Responses import trusted_response, text_response
 from src.Utils.Interface.IModels import (
     ChatRequest,
     ChatResponse,
@@ -54,7 +57,7 @@ async def chat(request: ChatRequest):
     """
     Endpoint pour les conversations avec l'IA via OpenRouter
     """
-    return await AIController.chat(request)
+    return trusted_response(await AIController.chat(request))
 
 
 @ai_router.post(
@@ -65,6 +68,13 @@ async def chat(request: ChatRequest):
     Analyse un CV et fournit des recommandations personnalisées.
     
     Si une description de poste est fournie, l'analyse comparera le CV avec les exigences du poste.
+
+    Avec `compact: true`, le modèle reçoit les compétences et l'expérience cumulée extraites
+    localement puis les sections utiles du CV tronquées, ce qui réduit la taille du prompt.
+
+    Si l'analyse a déjà été lancée par `/ai/extract-text` (`speculate=true`), son résultat est
+    réutilisé s'il porte sur le même texte, la même description de poste et le même mode
+    (un `analysis_handle` qui ne correspond pas à la requête est ignoré).
     
     **Exemple de requête :**
     ```json
@@ -94,7 +104,7 @@ async def analyze_cv(request: AnalyzeCVRequest):
     """
     Analyse un CV et le compare avec une description de poste (optionnelle)
     """
-    return await AIController.analyze_cv(request)
+    return trusted_response(await AIController.analyze_cv(request))
 
 
 @ai_router.post(
@@ -134,7 +144,7 @@ async def generate_job_description(request: GenerateJobDescriptionRequest):
     """
     Génère une description de poste optimisée et professionnelle
     """
-    return await AIController.generate_job_description(request)
+    return trusted_response(await AIController.generate_job_description(request))
 
 
 @ai_router.post(
@@ -142,14 +152,32 @@ async def generate_job_description(request: GenerateJobDescriptionRequest):
     response_model=ExtractTextResponse,
     summary="Extraire le texte d'un fichier",
     description="""
-    Extrait le texte d'un fichier PDF, DOCX ou TXT.
+    Extrait le texte d'un fichier PDF, Word, OpenDocument, RTF, HTML ou texte.
     
-    Formats supportés:
+    Formats supportés (détectés d'après le contenu du fichier, pas l'extension):
     - PDF (.pdf)
-    - Word (.docx)
+    - Word (.docx, .doc)
+    - OpenDocument (.odt)
+    - RTF (.rtf)
+    - HTML (.html)
     - Texte (.txt)
     
     Taille maximale: 10MB
+
+    La réponse JSON contient aussi `profile`, un profil structuré extrait localement
+    sans appel au modèle : sections du CV, compétences reconnues, périodes
+    d'expérience et durée cumulée, e-mails et téléphones (`profile=false` pour l'omettre).
+
+    Avec le champ `speculate=true` (et éventuellement `job_description`, `compact`),
+    l'analyse du CV démarre aussitôt en tâche de fond et `analysis_handle` est renvoyé
+    (en-tête `X-Analysis-Handle` en format texte). L'appel suivant à `/ai/analyze-cv`
+    pour le même texte et la même description de poste réutilise cette analyse, en
+    cours ou terminée, au lieu de relancer le modèle.
+
+    Le paramètre `format=text` retourne le texte brut (`text/plain`), les
+    métadonnées étant transmises dans les en-têtes `X-File-Name`, `X-File-Type`
+    et `X-Character-Count`. La réponse est compressée (brotli/gzip) selon
+    l'en-tête `Accept-Encoding` du client.
     """,
     responses={
         200: {
@@ -160,18 +188,83 @@ async def generate_job_description(request: GenerateJobDescriptionRequest):
                         "text": "John Doe\nDéveloppeur Full Stack\n5 ans d'expérience...",
                         "file_name": "cv.pdf",
                         "file_type": "pdf",
-                        "character_count": 1234
+                        "character_count": 1234,
+                        "profile": {
+                            "sections": [{"name": "experience", "start": 120, "end": 860}],
+                            "skills": [{"name": "React", "category": "frameworks", "occurrences": 3}],
+                            "experiences": [{"start": "2019-03", "end": None, "current": True, "months": 28, "label": "Mars 2019 – aujourd'hui : Développeur chez Acme"}],
+                            "total_experience_months": 28,
+                            "emails": ["john.doe@mail.com"],
+                            "phones": []
+                        }
                     }
+                },
+                "text/plain": {
+                    "example": "John Doe\nDéveloppeur Full Stack\n5 ans d'expérience..."
                 }
             }
         },
         400: {"description": "Format non supporté ou fichier invalide"},
+        413: {"description": "Requête trop volumineuse (refusée avant réception complète)"},
         500: {"description": "Erreur lors de l'extraction"},
     }
 )
-async def extract_text(file: UploadFile = File(...)):
+async def extract_text(
+    file: UploadFile = File(...),
+    format: Literal["json", "text"] = Query("json", description="Format de la réponse (json ou text)"),
+    profile: bool = Query(True, description="Inclure le profil structuré extrait localement (format json)"),
+    speculate: bool = Form(False, description="Lancer l'analyse du CV en tâche de fond dès l'extraction"),
+    job_description: Optional[str] = Form(None, description="Description de poste pour l'analyse lancée en tâche de fond"),
+    compact: bool = Form(False, description="Prompt compact pour l'analyse lancée en tâche de fond"),
+):
     """
-    Extrait le texte d'un fichier (PDF, DOCX, TXT)
+    Extrait le texte d'un fichier (PDF, DOCX, DOC, ODT, RTF, HTML, TXT)
     """
-    return await AIController.extract_text(file)
+    result = await AIController.extract_text(
+        file,
+        with_profile=profile and format == "json",
+        speculate=speculate,
+        job_description=job_description,
+        compact=compact,
+    )
+    if format == "text":
+        return text_response(result.text, result.file_name, result.file_type, result.analysis_handle)
+    return trusted_response(result)
+
 
+@ai_router.post(
+    "/extract-text/batch",
+    summary="Extraire le texte de plusieurs fichiers",
+    description="""
+    Extrait en parallèle le texte de plusieurs fichiers (CV, lettre de motivation,
+    certificats...) ou des fichiers contenus dans une archive ZIP.
+    
+    La réponse est un flux NDJSON (`application/x-ndjson`) : une ligne JSON par
+    fichier, émise dès que son extraction est terminée. Un fichier en échec produit
+    une ligne contenant `error` et `status_code` sans interrompre le lot.
+    
+    Limites: 10MB par fichier, 50MB et 20 fichiers par lot (configurables)
+    """,
+    responses={
+        200: {
+            "description": "Flux des résultats d'extraction",
+            "content": {
+                "application/x-ndjson": {
+                    "example": (
+                        '{"file_name":"cv.pdf","file_type":"pdf","character_count":1234,"text":"John Doe..."}\n'
+                        '{"file_name":"photo.png","error":"Impossible de déterminer le type de fichier","status_code":400}\n'
+                    )
+                }
+            }
+        },
+        400: {"description": "Aucun fichier reçu"},
+        413: {"description": "Lot trop volumineux ou trop de fichiers"},
+        500: {"description": "Erreur lors de la lecture des fichiers"},
+    }
+)
+async def extract_text_batch(files: List[UploadFile] = File(...)):
+    """
+    Extrait le texte de plusieurs fichiers en parallèle (flux NDJSON)
+    """
+    stream = await AIController.extract_text_batch(files)
+    return StreamingResponse(stream, media_type="application/x-ndjson")
@@ -0,0 +1,143 @@
+from typing import Optional
+from fastapi import APIRouter, Query
+from src.Controllers.Admin_controller import AdminController
+from src.Utils.Interface.IModels import UsageSummaryResponse
+from src.Utils.Responses import trusted_response
+
+admin_router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@admin_router.get(
+    "/usage",
+    response_model=UsageSummaryResponse,
+    summary="Consommation des modèles",
+    description="""
+    Agrège les appels aux modèles (tokens, latence, cache, erreurs) enregistrés
+    par le registre de consommation.
+    
+    Axes de regroupement: `model`, `provider`, `caller`, `feature`, `status`, `day`.
+    L'appelant est transmis par le backend via l'en-tête `x-caller-id` et la
+    fonctionnalité via `x-feature` (par défaut : le chemin de la route).
+    """,
+    responses={
+        400: {"description": "Axe de regroupement invalide"},
+        500: {"description": "Erreur lors de la lecture du registre"},
+    }
+)
+async def usage_summary(
+    group_by: str = Query("model", description="Axe de regroupement"),
+    since: Optional[float] = Query(None, description="Début de la période (horodatage Unix, inclus)"),
+    until: Optional[float] = Query(None, description="Fin de la période (horodatage Unix, exclu)"),
+):
+    """
+    Retourne la consommation agrégée des modèles
+    """
+    return trusted_response(await AdminController.usage_summary(group_by, since, until))
+
+
+@admin_router.get(
+    "/models",
+    summary="Statistiques du routeur de modèles",
+    description="""
+    Retourne, pour chaque modèle appelé depuis le démarrage, les statistiques
+    glissantes utilisées par le routeur : latence moyenne, débit (tokens/s),
+    taux d'erreur et mise à l'écart temporaire après échecs consécutifs.
+    """,
+    responses={
+        200: {
+            "description": "Statistiques par modèle",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "models": {
+                            "gpt-4o-mini": {
+                                "calls": 12,
+                                "errors": 0,
+                                "error_rate": 0.0,
+                                "latency_ms": 2140.3,
+                                "tokens_per_second": 61.2,
+                                "cooling_down": False
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def model_stats():
+    """
+    Retourne les statistiques du routeur de modèles
+    """
+    return await AdminController.model_stats()
+
+
+@admin_router.get(
+    "/domain-filter",
+    summary="Statistiques du pré-filtre hors domaine",
+    description="""
+    Retourne les compteurs du pré-filtre local placé devant le chat : demandes
+    examinées, refusées localement (appels au modèle évités), transmises, et
+    temps moyen de classification.
+    """,
+    responses={
+        200: {
+            "description": "Compteurs du pré-filtre",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "enabled": True,
+                        "threshold": 2.0,
+                        "checked": 1200,
+                        "blocked": 180,
+                        "passed": 1020,
+                        "saved_calls_ratio": 0.15,
+                        "avg_ms": 0.041
+                    }
+                }
+            }
+        }
+    }
+)
+async def domain_filter_stats():
+    """
+    Retourne les compteurs du pré-filtre hors domaine
+    """
+    return await AdminController.domain_filter_stats()
+
+
+@admin_router.get(
+    "/speculative-analysis",
+    summary="Statistiques de l'analyse spéculative",
+    description="""
+    Retourne les compteurs de l'analyse de CV lancée dès l'extraction : analyses
+    lancées, réutilisées par /ai/analyze-cv, manquées (identifiant fourni mais
+    analyse introuvable ou perdue), non lancées faute de capacité, en échec,
+    expirées sans avoir été réclamées, et analyses en cours.
+    """,
+    responses={
+        200: {
+            "description": "Compteurs de l'analyse spéculative",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "enabled": True,
+                        "entries": 12,
+                        "in_flight": 2,
+                        "started": 340,
+                        "skipped": 4,
+                        "hits": 301,
+                        "misses": 25,
+                        "failed": 3,
+                        "unused": 30
+                    }
+                }
+            }
+        }
+    }
+)
+async def speculative_analysis_stats():
+    """
+    Retourne les compteurs de l'analyse spéculative
+    """
+    return await AdminController.speculative_analysis_stats()
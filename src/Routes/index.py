@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 from src.Routes.AI_routes import ai_router
+from src.Routes.Admin_routes import admin_router
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
 router.include_router(ai_router)
-
+router.include_router(admin_router)
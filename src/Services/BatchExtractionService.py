@@ -0,0 +1,160 @@
+"""
+Service d'extraction de texte pour plusieurs fichiers (ou une archive ZIP)
+"""
+import asyncio
+import io
+import os
+import zipfile
+from typing import AsyncIterator, List, Tuple
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from src.Configs.Extraction_config import MAX_FILE_SIZE, MAX_BATCH_SIZE, MAX_BATCH_FILES, READ_CHUNK_SIZE
+from src.Services.ExtractionPool import ExtractionPool
+from src.Utils.BaseError import BaseError
+from src.Utils.FileSniffer import sniff_file_type, ZIP_MAGIC
+
+
+class BatchExtractionService:
+    @staticmethod
+    async def _read_upload(file: UploadFile, remaining: int) -> bytes:
+        """
+        Lit par blocs un fichier déjà reçu en contrôlant les limites du lot
+
+        Starlette a reçu tout le corps avant l'appel de la route : ces contrôles ne
+        réduisent pas la réception, ils répartissent les erreurs par fichier. La taille
+        totale de la requête est bornée en amont par UploadLimitMiddleware.
+
+        Raises:
+            BaseError: 400 si le fichier dépasse MAX_FILE_SIZE, 413 si le lot dépasse MAX_BATCH_SIZE
+        """
+        chunks = []
+        size = 0
+        while True:
+            chunk = await file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > remaining:
+                raise BaseError(f"Le lot est trop volumineux (max {MAX_BATCH_SIZE // (1024 * 1024)}MB)", 413)
+            if size > MAX_FILE_SIZE:
+                raise BaseError(f"Le fichier est trop volumineux (max {MAX_FILE_SIZE // (1024 * 1024)}MB)", 400)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _expand_zip(file_content: bytes, remaining: int) -> Tuple[List[Tuple[str, bytes]], List[dict]]:
+        """
+        Extrait les fichiers d'une archive ZIP en respectant les limites du lot
+
+        Les tailles déclarées dans l'archive sont vérifiées avant décompression,
+        puis la lecture est bornée pour ne pas faire confiance à ces en-têtes.
+        Comme pour un envoi direct, un fichier trop volumineux est rejeté seul (400).
+
+        Returns:
+            Tuple (documents [(nom, contenu)], fichiers rejetés individuellement)
+        """
+        documents = []
+        rejected = []
+        too_large = f"Le fichier est trop volumineux (max {MAX_FILE_SIZE // (1024 * 1024)}MB)"
+        with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+            entries = [
+                info for info in archive.infolist()
+                if not info.is_dir()
+                and not info.filename.startswith("__MACOSX/")
+                and not os.path.basename(info.filename).startswith(".")
+            ]
+            if len(entries) > MAX_BATCH_FILES:
+                raise BaseError(f"Trop de fichiers dans l'archive (max {MAX_BATCH_FILES})", 413)
+            declared = sum(info.file_size for info in entries if info.file_size <= MAX_FILE_SIZE)
+            if declared > remaining:
+                raise BaseError(f"Le lot est trop volumineux (max {MAX_BATCH_SIZE // (1024 * 1024)}MB)", 413)
+
+            for info in entries:
+                content = b""
+                if info.file_size <= MAX_FILE_SIZE:
+                    with archive.open(info) as entry:
+                        content = entry.read(MAX_FILE_SIZE + 1)
+                if info.file_size > MAX_FILE_SIZE or len(content) > MAX_FILE_SIZE:
+                    rejected.append({"file_name": info.filename, "error": too_large, "status_code": 400})
+                    continue
+                remaining -= len(content)
+                if remaining < 0:
+                    raise BaseError(f"Le lot est trop volumineux (max {MAX_BATCH_SIZE // (1024 * 1024)}MB)", 413)
+                documents.append((info.filename, content))
+        return documents, rejected
+
+    @staticmethod
+    async def read_batch(files: List[UploadFile]) -> Tuple[List[Tuple[str, bytes]], List[dict]]:
+        """
+        Lit les fichiers d'un lot et développe les archives ZIP
+
+        Returns:
+            Tuple (documents [(nom, contenu)], fichiers rejetés individuellement)
+
+        Raises:
+            BaseError: Si les limites du lot (nombre de fichiers, taille cumulée) sont dépassées
+        """
+        if not files:
+            raise BaseError("Aucun fichier reçu", 400)
+
+        documents = []
+        rejected = []
+        remaining = MAX_BATCH_SIZE
+        for file in files:
+            file_name = file.filename or "unknown"
+            try:
+                file_content = await BatchExtractionService._read_upload(file, remaining)
+            except BaseError as e:
+                if e.status_code == 413:
+                    raise
+                rejected.append({"file_name": file_name, "error": e.message, "status_code": e.status_code})
+                continue
+
+            if file_content.startswith(ZIP_MAGIC) and sniff_file_type(file_content) == "zip":
+                # Décompression hors boucle d'événements
+                entries, entries_rejected = await run_in_threadpool(
+                    BatchExtractionService._expand_zip, file_content, remaining
+                )
+                documents.extend(entries)
+                rejected.extend(entries_rejected)
+                remaining -= sum(len(content) for _, content in entries)
+            else:
+                documents.append((file_name, file_content))
+                remaining -= len(file_content)
+
+            if len(documents) > MAX_BATCH_FILES:
+                raise BaseError(f"Trop de fichiers dans le lot (max {MAX_BATCH_FILES})", 413)
+
+        return documents, rejected
+
+    @staticmethod
+    async def extract_batch(documents: List[Tuple[str, bytes]]) -> AsyncIterator[dict]:
+        """
+        Extrait les documents en parallèle dans le pool et les restitue au fil de l'eau
+
+        Yields:
+            Un résultat par document, dans l'ordre de fin de traitement
+        """
+        async def extract_one(file_name: str, file_content: bytes) -> dict:
+            try:
+                text, file_type = await ExtractionPool.extract(file_content, os.path.splitext(file_name)[1])
+            except BaseError as e:
+                return {"file_name": file_name, "error": e.message, "status_code": e.status_code}
+            except Exception as e:
+                # Une erreur inattendue ne doit pas interrompre le flux des autres fichiers
+                return {"file_name": file_name, "error": f"Erreur lors de l'extraction: {str(e)}", "status_code": 500}
+            return {
+                "file_name": file_name,
+                "file_type": file_type,
+                "character_count": len(text),
+                "text": text,
+            }
+
+        tasks = [asyncio.ensure_future(extract_one(name, content)) for name, content in documents]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client déconnecté : abandon des extractions encore en file
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,359 @@
+"""
+Import en masse de CVs hors ligne : extraction multi-processus, analyse optionnelle,
+résultats JSONL (et Parquet) avec point de reprise
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+import orjson
+from src.Configs.Extraction_config import MAX_FILE_SIZE, EXTRACTION_WORKERS, BULK_ANALYSIS_RATE, BULK_ANALYSIS_CONCURRENCY
+from src.Services.ExtractionPool import init_worker, extract_in_worker
+from src.Services.OpenRouterService import OpenRouterService
+from src.Services.ProfileExtractionService import ProfileExtractionService
+from src.Utils.BaseError import BaseError
+
+# Source d'un document : chemin sur disque (lu dans le worker) ou contenu déjà lu (entrée d'archive)
+Source = Union[str, bytes]
+
+STAGES = ("read", "extract", "profile", "analyze", "write")
+
+
+def _process_in_worker(source: Source, file_extension: str, with_profile: bool) -> dict:
+    """
+    Exécuté dans un worker : lecture, extraction et profil d'un document, avec durées par étape
+    """
+    timings = {}
+    started = time.perf_counter()
+    if isinstance(source, str):
+        try:
+            with open(source, "rb") as file:
+                content = file.read(MAX_FILE_SIZE + 1)
+        except OSError as e:
+            return {"status": "error", "error": f"Lecture impossible: {e}", "status_code": 500, "size": 0, "timings": timings}
+    else:
+        content = source
+    timings["read"] = (time.perf_counter() - started) * 1000
+
+    if len(content) > MAX_FILE_SIZE:
+        return {
+            "status": "error",
+            "error": f"Le fichier est trop volumineux (max {MAX_FILE_SIZE // (1024 * 1024)}MB)",
+            "status_code": 400,
+            "size": len(content),
+            "timings": timings,
+        }
+
+    started = time.perf_counter()
+    status, value, detail = extract_in_worker(content, file_extension)
+    timings["extract"] = (time.perf_counter() - started) * 1000
+    if status == "error":
+        return {"status": "error", "error": value, "status_code": detail, "size": len(content), "timings": timings}
+
+    result = {
+        "status": "ok",
+        "file_type": detail,
+        "character_count": len(value),
+        "text": value,
+        "size": len(content),
+        "timings": timings,
+    }
+    if with_profile:
+        started = time.perf_counter()
+        result["profile"] = ProfileExtractionService.extract_profile(value)
+        timings["profile"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def iter_documents(input_path: str, done: Optional[Set[str]] = None) -> Iterator[Tuple[str, Optional[Source], str]]:
+    """
+    Parcourt un dossier (récursivement, archives ZIP comprises), une archive ZIP ou un fichier
+
+    Args:
+        input_path: Dossier, archive ZIP ou fichier
+        done: Identifiants déjà traités (reprise) : leurs entrées d'archive ne sont ni lues ni décompressées
+
+    Yields:
+        (identifiant stable du document, source ou None si déjà traité, extension)
+    """
+    done = done or set()
+    if os.path.isdir(input_path):
+        for root, dirs, files in os.walk(input_path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                doc_id = os.path.relpath(path, input_path)
+                if zipfile.is_zipfile(path):
+                    yield from _iter_archive(path, doc_id, done)
+                else:
+                    yield doc_id, path, os.path.splitext(name)[1]
+    elif zipfile.is_zipfile(input_path):
+        yield from _iter_archive(input_path, os.path.basename(input_path), done)
+    else:
+        yield os.path.basename(input_path), input_path, os.path.splitext(input_path)[1]
+
+
+def _iter_archive(path: str, archive_id: str, done: Set[str]) -> Iterator[Tuple[str, Optional[Source], str]]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or name.startswith("."):
+                continue
+            doc_id = f"{archive_id}!{info.filename}"
+            extension = os.path.splitext(name)[1]
+            if doc_id in done:
+                yield doc_id, None, extension
+                continue
+            # Lecture bornée : la taille déclarée dans l'archive n'est pas fiable
+            with archive.open(info) as entry:
+                content = entry.read(MAX_FILE_SIZE + 1)
+            yield doc_id, content, extension
+
+
+class _Checkpoint:
+    """
+    Point de reprise : une ligne [position dans le fichier de sortie, identifiant] par document écrit
+
+    À la reprise, la sortie est tronquée à la dernière position enregistrée (ligne
+    éventuellement écrite à moitié lors d'une interruption) et les documents déjà
+    traités sont ignorés.
+    """
+
+    def __init__(self, path: str, output_path: str):
+        self.path = path
+        self.output_path = output_path
+        self._file = None
+
+    def load(self) -> Set[str]:
+        done, offset = set(), 0
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as file:
+                for line in file:
+                    try:
+                        offset, doc_id = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        break
+                    done.add(doc_id)
+        elif os.path.exists(self.output_path):
+            # Sortie sans point de reprise : reconstruit depuis les lignes complètes
+            entries = []
+            with open(self.output_path, "rb") as file:
+                for line in file:
+                    try:
+                        doc_id = orjson.loads(line)["id"]
+                    except (orjson.JSONDecodeError, KeyError, TypeError):
+                        break
+                    offset += len(line)
+                    entries.append([offset, doc_id])
+                    done.add(doc_id)
+            with open(self.path, "wb") as file:
+                file.writelines(orjson.dumps(entry) + b"\n" for entry in entries)
+
+        if os.path.exists(self.output_path) and os.path.getsize(self.output_path) > offset:
+            with open(self.output_path, "r+b") as file:
+                file.truncate(offset)
+        self._file = open(self.path, "ab")
+        return done
+
+    def commit(self, doc_id: str, offset: int):
+        self._file.write(orjson.dumps([offset, doc_id]) + b"\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _RateLimiter:
+    """
+    Espacement minimal entre deux appels (rate appels par seconde, 0 = illimité)
+    """
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self._interval
+
+
+class _Report:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.counts = {"processed": 0, "succeeded": 0, "failed": 0, "skipped": 0, "analyzed": 0, "analysis_failed": 0}
+        self.bytes = 0
+        self.timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+
+    def add_timings(self, timings: dict):
+        for stage, value in timings.items():
+            self.timings[stage].append(value)
+
+    def to_dict(self) -> dict:
+        wall = time.perf_counter() - self.started
+        stages = {}
+        for stage, values in self.timings.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            stages[stage] = {
+                "count": len(values),
+                "total_s": round(sum(values) / 1000, 3),
+                "mean_ms": round(sum(values) / len(values), 2),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+            }
+        return {
+            **self.counts,
+            "wall_s": round(wall, 3),
+            "documents_per_s": round(self.counts["processed"] / wall, 2) if wall else 0.0,
+            "input_mb": round(self.bytes / (1024 * 1024), 2),
+            "mb_per_s": round(self.bytes / (1024 * 1024) / wall, 2) if wall else 0.0,
+            "stages": stages,
+        }
+
+
+class BulkImportService:
+    @staticmethod
+    async def run(
+        input_path: str,
+        output_path: str,
+        checkpoint_path: Optional[str] = None,
+        workers: int = EXTRACTION_WORKERS,
+        with_profile: bool = True,
+        analyze: bool = False,
+        job_description: Optional[str] = None,
+        compact: bool = False,
+        analysis_rate: float = BULK_ANALYSIS_RATE,
+        analysis_concurrency: int = BULK_ANALYSIS_CONCURRENCY,
+        progress: Optional[Callable[[dict], None]] = None,
+    ) -> dict:
+        """
+        Traite tous les documents de `input_path` et ajoute une ligne JSON par document à `output_path`
+
+        Les documents déjà présents dans le point de reprise sont ignorés : une exécution
+        interrompue reprend là où elle s'était arrêtée.
+
+        Returns:
+            Rapport (compteurs, débit, durées par étape)
+        """
+        report = _Report()
+        checkpoint = _Checkpoint(checkpoint_path or f"{output_path}.checkpoint", output_path)
+        done = checkpoint.load()
+
+        loop = asyncio.get_running_loop()
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        )
+        # Documents en vol bornés : la mémoire reste constante quelle que soit la taille du corpus
+        in_flight = asyncio.Semaphore(workers * 4)
+        analysis_slots = asyncio.Semaphore(analysis_concurrency)
+        limiter = _RateLimiter(analysis_rate)
+        tasks = set()
+
+        async def analyze_text(row: dict):
+            async with analysis_slots:
+                await limiter.wait()
+                started = time.perf_counter()
+                try:
+                    result = await OpenRouterService.analyze_cv(row["text"], job_description, compact)
+                    row["analysis"] = result["content"]
+                    row["model"] = result["model"]
+                    report.counts["analyzed"] += 1
+                except BaseError as e:
+                    row["analysis_error"] = e.message
+                    report.counts["analysis_failed"] += 1
+                row["timings"]["analyze"] = (time.perf_counter() - started) * 1000
+
+        async def process(doc_id: str, source: Source, file_extension: str):
+            try:
+                result = await loop.run_in_executor(executor, _process_in_worker, source, file_extension, with_profile)
+            except Exception as e:
+                result = {"status": "error", "error": str(e), "status_code": 500, "size": 0, "timings": {}}
+
+            status = result.pop("status")
+            report.bytes += result.pop("size")
+            row = {"id": doc_id, **result}
+            if status == "ok":
+                report.counts["succeeded"] += 1
+                if analyze:
+                    await analyze_text(row)
+            else:
+                report.counts["failed"] += 1
+
+            started = time.perf_counter()
+            output.write(orjson.dumps(row) + b"\n")
+            output.flush()
+            checkpoint.commit(doc_id, output.tell())
+            row["timings"]["write"] = (time.perf_counter() - started) * 1000
+
+            report.add_timings(row["timings"])
+            report.counts["processed"] += 1
+            if progress and report.counts["processed"] % 100 == 0:
+                progress(report.to_dict())
+
+        def finished(task: asyncio.Task):
+            tasks.discard(task)
+            in_flight.release()
+
+        try:
+            with open(output_path, "ab") as output:
+                for doc_id, source, file_extension in iter_documents(input_path, done):
+                    if doc_id in done:
+                        report.counts["skipped"] += 1
+                        continue
+                    await in_flight.acquire()
+                    task = asyncio.create_task(process(doc_id, source, file_extension))
+                    tasks.add(task)
+                    task.add_done_callback(finished)
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            checkpoint.close()
+
+        return report.to_dict()
+
+    @staticmethod
+    def write_parquet(jsonl_path: str, parquet_path: str) -> int:
+        """
+        Convertit le fichier JSONL de résultats en Parquet (nécessite pyarrow)
+
+        Returns:
+            Nombre de lignes écrites
+
+        Raises:
+            BaseError: Si pyarrow n'est pas installé
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise BaseError("L'export Parquet nécessite pyarrow (pip install pyarrow)", 500)
+
+        with open(jsonl_path, "rb") as file:
+            rows = [orjson.loads(line) for line in file if line.strip()]
+        # Profil et durées en JSON : schéma stable quel que soit le contenu des CVs
+        for row in rows:
+            for key in ("profile", "timings"):
+                if key in row:
+                    row[key] = orjson.dumps(row[key]).decode()
+        # Colonnes sur l'union des clés (les lignes en erreur n'ont ni texte ni profil)
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        table = pa.table({key: [row.get(key) for row in rows] for key in columns})
+        pq.write_table(table, parquet_path)
+        return len(rows)
@@ -0,0 +1,117 @@
+"""
+Pré-filtre local des demandes de chat clairement hors du domaine du recrutement
+
+Classifieur par mots-clés (CPU, sans appel réseau) : les demandes nettement hors
+domaine reçoivent directement le refus standard, les cas ambigus sont transmis
+au modèle qui reste protégé par PROTECTIVE_SYSTEM_PROMPT.
+"""
+import re
+import time
+import unicodedata
+from typing import Optional
+from src.Configs.AI_config import DOMAIN_FILTER_ENABLED, DOMAIN_FILTER_THRESHOLD, DOMAIN_REFUSAL_MESSAGE
+from src.Services.UsageLedger import UsageLedger
+from src.Utils.Interface.IModels import ChatRequest
+
+# Racines (texte normalisé : minuscules, sans accents)
+IN_DOMAIN_STEMS = [
+    "recrut", "emploi", "cv", "curriculum", "candidat", "postul", "entretien", "embauch", "carriere",
+    "competence", "lettre de motivation", "motivation", "offre", "poste", "salaire", "remuneration",
+    "stage", "stagiaire", "alternan", "contrat", "cdi", "cdd", "freelance", "metier", "profession",
+    "experience", "diplome", "formation", "reconversion", "linkedin", "portfolio", "manager",
+    "entreprise", "employeur", "talent", "job", "resume", "interview", "hiring", "recruit", "career",
+    "skill", "plateforme", "profil", "travail", "licenciement", "demission", "preavis", "onboarding",
+]
+
+# Termes fortement associés à un autre domaine (poids 2)
+STRONG_OFF_DOMAIN_STEMS = [
+    "recette", "cuisiner", "cuisson", "patisserie", "ingredient", "meteo", "horoscope", "astrolog",
+    "blague", "poeme", "chanson", "paroles de", "football", "basket", "match de", "ligue des champions",
+    "capitale de", "qui a gagne", "film", "serie tele", "jeu video", "recipe", "weather", "joke",
+    "poem", "lyrics", "soccer",
+]
+
+# Termes souvent hors domaine mais plus ambigus (poids 1)
+WEAK_OFF_DOMAIN_STEMS = [
+    "gateau", "chocolat", "dessert", "pates", "pizza", "restaurant", "vacances", "voyage", "hotel",
+    "plage", "sport", "score", "equipe de france", "musique", "acteur", "chanteur", "roman", "planete",
+    "univers", "dinosaure", "animal", "chien", "jardin", "voiture", "maladie", "symptome",
+    "medicament", "regime", "politique", "election", "religion", "histoire de", "devinette", "cook",
+    "movie", "travel", "game",
+]
+
+
+def _compile(stems: list):
+    return re.compile(r"\b(?:" + "|".join(re.escape(stem) for stem in stems) + r")", re.IGNORECASE)
+
+
+_IN_DOMAIN = _compile(IN_DOMAIN_STEMS)
+_STRONG_OFF_DOMAIN = _compile(STRONG_OFF_DOMAIN_STEMS)
+_WEAK_OFF_DOMAIN = _compile(WEAK_OFF_DOMAIN_STEMS)
+
+
+def _normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class DomainFilter:
+    _metrics = {"checked": 0, "blocked": 0, "passed": 0, "total_ms": 0.0}
+
+    @staticmethod
+    def score(text: str) -> float:
+        """
+        Score hors domaine : termes hors domaine pondérés moins deux fois les termes du recrutement
+        """
+        normalized = _normalize(text)
+        in_hits = len(set(_IN_DOMAIN.findall(normalized)))
+        strong_hits = len(set(_STRONG_OFF_DOMAIN.findall(normalized)))
+        weak_hits = len(set(_WEAK_OFF_DOMAIN.findall(normalized)))
+        return 2 * strong_hits + weak_hits - 2 * in_hits
+
+    @staticmethod
+    def screen(request: ChatRequest) -> Optional[dict]:
+        """
+        Évalue le dernier message utilisateur
+
+        Returns:
+            Réponse de refus (même forme que les services de chat) si la demande est
+            clairement hors domaine, None si elle doit être transmise au modèle
+        """
+        if not DOMAIN_FILTER_ENABLED:
+            return None
+
+        last_user = next((m.content for m in reversed(request.messages) if m.role == "user"), None)
+        if not last_user:
+            return None
+
+        started = time.perf_counter()
+        blocked = DomainFilter.score(last_user) >= DOMAIN_FILTER_THRESHOLD
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        metrics = DomainFilter._metrics
+        metrics["checked"] += 1
+        metrics["total_ms"] += elapsed_ms
+        if not blocked:
+            metrics["passed"] += 1
+            return None
+
+        metrics["blocked"] += 1
+        UsageLedger.record("local", "domain-filter", None, elapsed_ms, status="filtered")
+        return {"content": DOMAIN_REFUSAL_MESSAGE, "model": "local/domain-filter", "usage": None}
+
+    @staticmethod
+    def stats() -> dict:
+        """
+        Compteurs du pré-filtre (demandes refusées localement = appels au modèle évités)
+        """
+        metrics = DomainFilter._metrics
+        return {
+            "enabled": DOMAIN_FILTER_ENABLED,
+            "threshold": DOMAIN_FILTER_THRESHOLD,
+            "checked": metrics["checked"],
+            "blocked": metrics["blocked"],
+            "passed": metrics["passed"],
+            "saved_calls_ratio": round(metrics["blocked"] / metrics["checked"], 3) if metrics["checked"] else 0.0,
+            "avg_ms": round(metrics["total_ms"] / metrics["checked"], 3) if metrics["checked"] else 0.0,
+        }
@@ -0,0 +1,147 @@
+"""
+Pool de processus pour l'extraction de texte (parsing CPU hors du GIL du serveur)
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple, TypeVar
+from starlette.concurrency import run_in_threadpool
+from src.Configs.Extraction_config import EXTRACTION_WORKERS
+from src.Services.FileExtractionService import FileExtractionService
+from src.Services.OCRService import OCRService
+from src.Utils.BaseError import BaseError
+from src.Utils.Deadline import with_deadline
+
+T = TypeVar("T")
+
+POOL_ERROR = "Le service d'extraction est momentanément indisponible, veuillez réessayer"
+
+
+def init_worker():
+    """
+    Initialiseur des workers d'extraction (pool du serveur et import en masse)
+
+    Pas de pool OCR imbriqué : le worker est déjà un processus borné.
+    """
+    OCRService.use_inline()
+
+
+def extract_in_worker(file_content: bytes, file_extension: str) -> tuple:
+    """
+    Exécuté dans un worker : retourne ("ok", texte, type) ou ("error", message, code)
+
+    Les BaseError ne sont pas relancées telles quelles car leur code HTTP
+    serait perdu lors de la sérialisation vers le processus parent.
+    """
+    try:
+        text, file_type = FileExtractionService.extract_document(file_content, file_extension)
+        return "ok", text, file_type
+    except BaseError as e:
+        return "error", e.message, e.status_code
+    except Exception as e:
+        return "error", f"Erreur lors de l'extraction: {str(e)}", 500
+
+
+class ExtractionPool:
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+    _pending = 0
+    # Extractions d'un fichier unique exécutées dans un thread du serveur
+    _threads = 0
+
+    @staticmethod
+    def _get_executor() -> ProcessPoolExecutor:
+        with ExtractionPool._lock:
+            if ExtractionPool._executor is None:
+                ExtractionPool._executor = ProcessPoolExecutor(
+                    max_workers=EXTRACTION_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_worker,
+                )
+            return ExtractionPool._executor
+
+    @staticmethod
+    def _reset_executor(executor: ProcessPoolExecutor):
+        """
+        Abandonne un pool cassé (worker tué) : le prochain appel en crée un neuf
+        """
+        with ExtractionPool._lock:
+            if ExtractionPool._executor is executor:
+                logging.error("Extraction: pool de processus cassé, il sera recréé au prochain appel")
+                ExtractionPool._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def pending() -> int:
+        """
+        Nombre d'extractions soumises et non terminées (en file ou en cours), pool de
+        processus et threads du serveur confondus
+        """
+        return ExtractionPool._pending + ExtractionPool._threads
+
+    @staticmethod
+    async def run_in_thread(func: Callable[..., T], *args: Any) -> T:
+        """
+        Exécute une extraction dans un thread du serveur, comptée dans pending()
+
+        Utilisé pour un fichier unique, dont l'OCR garde son pool dédié (pages en
+        parallèle). L'extraction reste comptée jusqu'à la fin du thread, même si la
+        requête a déjà reçu son 504.
+
+        Raises:
+            BaseError: 504 si l'échéance de la requête est dépassée
+        """
+        ExtractionPool._threads += 1
+        try:
+            # run_in_threadpool attend la fin du thread même en cas d'annulation
+            return await with_deadline(run_in_threadpool(func, *args))
+        finally:
+            ExtractionPool._threads -= 1
+
+    @staticmethod
+    async def extract(file_content: bytes, file_extension: str = "") -> Tuple[str, str]:
+        """
+        Extrait le texte d'un fichier dans un worker du pool
+
+        Returns:
+            Tuple (texte extrait, type détecté)
+
+        Raises:
+            BaseError: Si le format n'est pas supporté, si l'extraction échoue,
+                si le pool est cassé (503) ou si l'échéance de la requête est dépassée (504)
+        """
+        loop = asyncio.get_running_loop()
+        executor = ExtractionPool._get_executor()
+        ExtractionPool._pending += 1
+        try:
+            # Au-delà de l'échéance de la requête : 504, et le fichier est retiré de la file s'il n'a pas démarré
+            status, value, detail = await with_deadline(loop.run_in_executor(
+                executor, extract_in_worker, file_content, file_extension
+            ))
+        except BrokenProcessPool:
+            # Un worker a été tué (mémoire, signal) : le pool est inutilisable, il sera recréé
+            ExtractionPool._reset_executor(executor)
+            raise BaseError(POOL_ERROR, 503)
+        except BaseError:
+            raise
+        except Exception as e:
+            raise BaseError(f"Erreur lors de l'extraction: {str(e)}", 500)
+        finally:
+            ExtractionPool._pending -= 1
+
+        if status == "error":
+            raise BaseError(value, detail)
+        return value, detail
+
+    @staticmethod
+    def shutdown():
+        """
+        Arrête le pool de processus d'extraction
+        """
+        with ExtractionPool._lock:
+            if ExtractionPool._executor is not None:
+                ExtractionPool._executor.shutdown(wait=False, cancel_futures=True)
+                ExtractionPool._executor = None
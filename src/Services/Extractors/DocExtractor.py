@@ -0,0 +1,79 @@
+"""
+Extraction du texte DOC (Word 97-2003) via la table des pièces du flux WordDocument
+"""
+import re
+import struct
+import olefile
+from src.Utils.BaseError import BaseError
+
+# Champs : \x13 instruction \x14 résultat \x15 -> on ne garde que le résultat
+_FIELD_WITH_RESULT = re.compile("\x13[^\x13\x14\x15]*\x14")
+_FIELD_WITHOUT_RESULT = re.compile("\x13[^\x13\x14\x15]*\x15")
+_CONTROL_CHARS = re.compile("[\x00-\x08\x0e-\x1f]")
+
+
+def extract_doc_text(file_content: bytes) -> str:
+    """
+    Extrait le texte principal d'un document Word binaire
+    """
+    with olefile.OleFileIO(file_content) as ole:
+        if not ole.exists("WordDocument"):
+            raise BaseError("Le fichier n'est pas un document Word (DOC)", 400)
+        word = ole.openstream("WordDocument").read()
+
+        flags = struct.unpack_from("<H", word, 0x000A)[0]
+        if flags & 0x0100:
+            raise BaseError("Le document Word est protégé par mot de passe", 400)
+        table_name = "1Table" if flags & 0x0200 else "0Table"
+        if not ole.exists(table_name):
+            raise BaseError("Document Word incomplet (table des pièces absente)", 400)
+        table = ole.openstream(table_name).read()
+
+    # FibRgLw97.ccpText : nombre de caractères du corps du document
+    ccp_text = struct.unpack_from("<i", word, 0x004C)[0]
+    fc_clx, lcb_clx = struct.unpack_from("<II", word, 0x01A2)
+    text = _read_pieces(word, table[fc_clx:fc_clx + lcb_clx], ccp_text)
+    return _clean(text)
+
+
+def _read_pieces(word: bytes, clx: bytes, ccp_text: int) -> str:
+    pos = 0
+    # Prc (0x01) : modifications de propriétés, ignorées
+    while pos < len(clx) and clx[pos] == 0x01:
+        pos += 3 + struct.unpack_from("<H", clx, pos + 1)[0]
+    if pos >= len(clx) or clx[pos] != 0x02:
+        raise BaseError("Document Word invalide (table des pièces illisible)", 400)
+
+    lcb = struct.unpack_from("<I", clx, pos + 1)[0]
+    plc = clx[pos + 5:pos + 5 + lcb]
+    count = (lcb - 4) // 12
+    cps = struct.unpack_from(f"<{count + 1}I", plc, 0)
+
+    parts = []
+    remaining = ccp_text
+    for i in range(count):
+        if remaining <= 0:
+            break
+        fc_value = struct.unpack_from("<I", plc, 4 * (count + 1) + 8 * i + 2)[0]
+        length = min(cps[i + 1] - cps[i], remaining)
+        fc = fc_value & 0x3FFFFFFF
+        if fc_value & 0x40000000:
+            # Pièce compressée : 1 octet par caractère (cp1252)
+            start = fc // 2
+            parts.append(word[start:start + length].decode("cp1252", errors="replace"))
+        else:
+            parts.append(word[fc:fc + 2 * length].decode("utf-16-le", errors="replace"))
+        remaining -= length
+    return "".join(parts)
+
+
+def _clean(text: str) -> str:
+    text = _FIELD_WITH_RESULT.sub("", text)
+    text = _FIELD_WITHOUT_RESULT.sub("", text).replace("\x15", "")
+    # Fin de ligne de tableau (\x07\x07) puis fin de cellule (\x07)
+    text = text.replace("\x07\x07", "\n").replace("\x07", " | ")
+    text = text.replace("\r", "\n").replace("\x0b", "\n").replace("\x0c", "\n")
+    text = text.replace("\x1e", "-").replace("\x1f", "")
+    text = _CONTROL_CHARS.sub("", text)
+    lines = [line.rstrip(" |").rstrip() for line in text.split("\n")]
+    return "\n".join(line for line in lines if line).strip()
@@ -0,0 +1,73 @@
+"""
+Extraction du texte DOCX par lecture en flux de `word/document.xml`
+
+Évite de charger le modèle objet complet de python-docx : les paragraphes et
+les lignes de tableaux sont émis dans l'ordre du document puis libérés. Les
+cellules fusionnées n'apparaissant qu'une fois dans le XML, elles ne sont pas
+dupliquées.
+"""
+import io
+import zipfile
+from src.Services.Extractors.XmlStream import XmlStream
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+P, R, T, TAB, BR, CR = W + "p", W + "r", W + "t", W + "tab", W + "br", W + "cr"
+TR, TC = W + "tr", W + "tc"
+
+
+def extract_docx_text(file_content: bytes) -> str:
+    """
+    Extrait le texte d'un DOCX (paragraphes et tableaux, dans l'ordre du document)
+    """
+    with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+        with archive.open("word/document.xml") as xml_file:
+            return '\n'.join(_read_lines(xml_file)).strip()
+
+
+def _read_lines(xml_file) -> list:
+    lines = []
+    paragraphs = []  # tampons des paragraphes ouverts (zones de texte imbriquées)
+    rows = []        # cellules de la ligne courante, par tableau ouvert
+    cells = []       # lignes de la cellule courante, par cellule ouverte
+    in_run = 0
+
+    stream = XmlStream(xml_file)
+    for event, elem in stream:
+        tag = elem.tag
+        if event == "start":
+            if tag == P:
+                paragraphs.append([])
+            elif tag == R:
+                in_run += 1
+            elif tag == TR:
+                rows.append([])
+            elif tag == TC:
+                cells.append([])
+            continue
+
+        if tag == T:
+            if paragraphs:
+                paragraphs[-1].append(elem.text or "")
+        elif tag == R:
+            in_run -= 1
+        elif tag == TAB and in_run and paragraphs:
+            paragraphs[-1].append("\t")
+        elif tag in (BR, CR) and in_run and paragraphs:
+            paragraphs[-1].append("\n")
+        elif tag == P:
+            text = "".join(paragraphs.pop())
+            if text.strip():
+                (cells[-1] if cells else lines).append(text)
+            stream.release(elem)
+        elif tag == TC:
+            cell_text = '\n'.join(cells.pop()).strip()
+            if cell_text:
+                rows[-1].append(cell_text)
+            stream.release(elem)
+        elif tag == TR:
+            row = rows.pop()
+            if row:
+                (cells[-1] if cells else lines).append(' | '.join(row))
+            stream.release(elem)
+
+    return lines
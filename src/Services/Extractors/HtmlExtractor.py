@@ -0,0 +1,64 @@
+"""
+Extraction du texte HTML (parseur de la bibliothèque standard)
+"""
+import re
+from html.parser import HTMLParser
+from src.Utils.FileSniffer import decode_text
+
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "head", "svg"}
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+CELL_TAGS = {"td", "th"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class _TextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag in CELL_TAGS:
+            self.parts.append(" | ")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            # Les retours à la ligne du source ne sont pas significatifs en HTML
+            self.parts.append(_WHITESPACE.sub(" ", data))
+
+
+def extract_html_text(file_content: bytes) -> str:
+    """
+    Extrait le texte visible d'une page HTML
+    """
+    html = decode_text(file_content)
+
+    parser = _TextParser()
+    parser.feed(html)
+    parser.close()
+
+    lines = []
+    for line in "".join(parser.parts).splitlines():
+        line = " ".join(line.split()).strip("| ")
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,79 @@
+"""
+Extraction du texte ODT (OpenDocument) par lecture en flux de `content.xml`
+"""
+import io
+import zipfile
+from src.Services.Extractors.XmlStream import XmlStream
+
+TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+P, H = TEXT + "p", TEXT + "h"
+SPACE, TAB, LINE_BREAK = TEXT + "s", TEXT + "tab", TEXT + "line-break"
+ROW, CELL = TABLE + "table-row", TABLE + "table-cell"
+
+
+def extract_odt_text(file_content: bytes) -> str:
+    """
+    Extrait le texte d'un ODT (paragraphes, titres et tableaux)
+    """
+    with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+        with archive.open("content.xml") as xml_file:
+            return '\n'.join(_read_lines(xml_file)).strip()
+
+
+def _inline_text(elem) -> str:
+    """
+    Texte d'un paragraphe, en tenant compte des espaces et tabulations encodés
+    """
+    parts = [elem.text or ""]
+    for child in elem:
+        if child.tag == SPACE:
+            parts.append(" " * int(child.get(TEXT + "c", "1")))
+        elif child.tag == TAB:
+            parts.append("\t")
+        elif child.tag == LINE_BREAK:
+            parts.append("\n")
+        else:
+            parts.append(_inline_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _read_lines(xml_file) -> list:
+    lines = []
+    rows = []
+    cells = []
+    paragraph_depth = 0
+
+    stream = XmlStream(xml_file)
+    for event, elem in stream:
+        tag = elem.tag
+        if event == "start":
+            if tag in (P, H):
+                paragraph_depth += 1
+            elif tag == ROW:
+                rows.append([])
+            elif tag == CELL:
+                cells.append([])
+            continue
+
+        if tag in (P, H):
+            paragraph_depth -= 1
+            # Les paragraphes imbriqués (cadres, notes) sont lus avec leur parent
+            if paragraph_depth == 0:
+                text = _inline_text(elem)
+                if text.strip():
+                    (cells[-1] if cells else lines).append(text)
+                stream.release(elem)
+        elif tag == CELL:
+            cell_text = '\n'.join(cells.pop()).strip()
+            if cell_text:
+                rows[-1].append(cell_text)
+            stream.release(elem)
+        elif tag == ROW:
+            row = rows.pop()
+            if row:
+                (cells[-1] if cells else lines).append(' | '.join(row))
+            stream.release(elem)
+
+    return lines
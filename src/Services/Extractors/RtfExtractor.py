@@ -0,0 +1,105 @@
+"""
+Extraction du texte RTF (analyse des mots de contrôle, sans dépendance externe)
+"""
+import codecs
+import re
+
+_TOKEN = re.compile(
+    r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|(.)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Groupes dont le contenu n'est pas du texte affiché
+DESTINATIONS = {
+    "aftncn", "aftnsep", "aftnsepc", "annotation", "atnauthor", "atndate", "atnid", "atnparent",
+    "atnref", "atrfend", "atrfstart", "author", "background", "bkmkend", "bkmkstart", "buptim",
+    "category", "colortbl", "comment", "company", "creatim", "datafield", "do", "doccomm",
+    "docvar", "dptxbxtext", "falt", "fchars", "ffdeftext", "ffentrymcr", "ffexitmcr",
+    "ffformat", "ffhelptext", "ffl", "ffname", "ffstattext", "fldinst", "fonttbl", "footer",
+    "footerf", "footerl", "footerr", "footnote", "formfield", "ftncn", "ftnsep", "ftnsepc",
+    "generator", "header", "headerf", "headerl", "headerr", "hlinkbase", "info", "keywords",
+    "latentstyles", "lchars", "levelnumbers", "leveltext", "lfolevel", "list", "listlevel",
+    "listname", "listoverride", "listoverridetable", "listpicture", "liststylename", "listtable",
+    "listtext", "lsdlockedexcept", "macc", "manager", "nonshppict", "object", "objdata",
+    "operator", "pict", "pn", "pntext", "pntxta", "pntxtb", "printim", "private", "revtbl",
+    "revtim", "rsidtbl", "rxe", "shp", "shpinst", "stylesheet", "subject", "tc", "template",
+    "themedata", "title", "txe", "userprops", "xe", "xmlnstbl",
+}
+
+SPECIAL_CHARS = {
+    "par": "\n", "line": "\n", "sect": "\n\n", "page": "\n\n", "row": "\n", "cell": " | ",
+    "tab": "\t", "emdash": "\u2014", "endash": "\u2013", "emspace": "\u2003", "enspace": "\u2002",
+    "bullet": "\u2022", "lquote": "\u2018", "rquote": "\u2019", "ldblquote": "\u201c",
+    "rdblquote": "\u201d",
+}
+
+
+def extract_rtf_text(file_content: bytes) -> str:
+    """
+    Extrait le texte d'un document RTF
+    """
+    rtf = file_content.decode("latin-1")
+    stack = []
+    ignorable = False
+    uc_skip = 1
+    skip = 0
+    codepage = "cp1252"
+    out = []
+
+    for match in _TOKEN.finditer(rtf):
+        word, arg, hex_code, char, brace, text_char = match.groups()
+        if brace:
+            skip = 0
+            if brace == "{":
+                stack.append((uc_skip, ignorable))
+            elif stack:
+                uc_skip, ignorable = stack.pop()
+        elif char:
+            skip = 0
+            if char == "*":
+                ignorable = True
+            elif ignorable:
+                continue
+            elif char == "~":
+                out.append("\xa0")
+            elif char in "{}\\":
+                out.append(char)
+        elif word:
+            skip = 0
+            if word in DESTINATIONS:
+                ignorable = True
+            elif word == "ansicpg" and arg:
+                codepage = _valid_codepage(f"cp{arg}", codepage)
+            elif ignorable:
+                continue
+            elif word in SPECIAL_CHARS:
+                out.append(SPECIAL_CHARS[word])
+            elif word == "uc" and arg:
+                uc_skip = int(arg)
+            elif word == "u" and arg:
+                code = int(arg)
+                out.append(chr(code + 0x10000 if code < 0 else code))
+                skip = uc_skip
+        elif hex_code:
+            if skip > 0:
+                skip -= 1
+            elif not ignorable:
+                out.append(bytes([int(hex_code, 16)]).decode(codepage, errors="replace"))
+        elif text_char:
+            if skip > 0:
+                skip -= 1
+            elif not ignorable:
+                out.append(text_char)
+
+    text = "".join(out)
+    # Séparateur de cellule superflu en fin de ligne de tableau
+    text = re.sub(r" \| *\n", "\n", text)
+    return "\n".join(line.rstrip() for line in text.splitlines()).strip()
+
+
+def _valid_codepage(name: str, default: str) -> str:
+    try:
+        codecs.lookup(name)
+        return name
+    except LookupError:
+        return default
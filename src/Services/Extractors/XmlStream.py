@@ -0,0 +1,33 @@
+"""
+Lecture en flux d'un document XML avec libération des éléments déjà traités
+"""
+from typing import IO, Iterator, Tuple
+from xml.etree.ElementTree import Element, iterparse
+
+
+class XmlStream:
+    """
+    iterparse qui suit les éléments ouverts pour pouvoir détacher un élément traité de
+    son parent : clear() seul vide l'élément mais le laisse dans l'arbre, qui grossit
+    alors d'un nœud par paragraphe sur les longs documents.
+    """
+
+    def __init__(self, xml_file: IO[bytes]):
+        self._xml_file = xml_file
+        self._open = []
+
+    def __iter__(self) -> Iterator[Tuple[str, Element]]:
+        for event, elem in iterparse(self._xml_file, events=("start", "end")):
+            if event == "start":
+                self._open.append(elem)
+            else:
+                self._open.pop()
+            yield event, elem
+
+    def release(self, elem: Element):
+        """
+        Vide un élément dont l'événement "end" vient d'être traité et le retire de son parent
+        """
+        elem.clear()
+        if self._open:
+            self._open[-1].remove(elem)
@@ -0,0 +1,2 @@
+# Package Extractors
+
@@ -2,18 +2,40 @@
 Service pour l'extraction de texte depuis différents formats de fichiers
 """
 import io
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 from PyPDF2 import PdfReader
-from docx import Document
 from src.Utils.BaseError import BaseError
+from src.Utils.FileSniffer import sniff_file_type, decode_text
+from src.Services.OCRService import OCRService
+from src.Services.Extractors.DocxExtractor import extract_docx_text
+from src.Services.Extractors.OdtExtractor import extract_odt_text
+from src.Services.Extractors.RtfExtractor import extract_rtf_text
+from src.Services.Extractors.DocExtractor import extract_doc_text
+from src.Services.Extractors.HtmlExtractor import extract_html_text
 
 
 class FileExtractionService:
+    # Registre des extracteurs : type détecté par signature -> fonction d'extraction
+    _extractors: Dict[str, Callable[[bytes], str]] = {}
+
+    @staticmethod
+    def register_extractor(file_type: str, extractor: Callable[[bytes], str]):
+        """
+        Enregistre (ou remplace) l'extracteur associé à un type de fichier
+        """
+        FileExtractionService._extractors[file_type] = extractor
+
+    @staticmethod
+    def supported_types() -> list:
+        return list(FileExtractionService._extractors)
+
     @staticmethod
     def extract_text_from_pdf(file_content: bytes) -> str:
         """
         Extrait le texte d'un fichier PDF
         
+        Les pages sans couche texte passent par l'OCR lorsqu'il est disponible.
+        
         Args:
             file_content: Contenu binaire du fichier PDF
             
@@ -26,14 +48,23 @@ class FileExtractionService:
         try:
             pdf_file = io.BytesIO(file_content)
             reader = PdfReader(pdf_file)
-            text_parts = []
+            text_parts = {}
+            missing_pages = []
             
-            for page in reader.pages:
+            for index, page in enumerate(reader.pages):
                 text = page.extract_text()
-                if text:
-                    text_parts.append(text)
+                if text and text.strip():
+                    text_parts[index] = text
+                else:
+                    missing_pages.append(index)
             
-            full_text = '\n'.join(text_parts).strip()
+            # Pages sans couche texte (scannées) : OCR si disponible
+            if missing_pages and OCRService.is_available():
+                text_parts.update(OCRService.ocr_pdf_pages(file_content, missing_pages))
+            
+            full_text = '\n'.join(
+                text_parts[index] for index in sorted(text_parts) if text_parts[index].strip()
+            ).strip()
             
             if not full_text:
                 raise BaseError("Le PDF ne contient pas de texte extractible (peut-être une image scannée)", 400)
@@ -59,25 +90,8 @@ class FileExtractionService:
             BaseError: Si l'extraction échoue
         """
         try:
-            docx_file = io.BytesIO(file_content)
-            doc = Document(docx_file)
-            text_parts = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
-            
-            # Extraire aussi le texte des tableaux
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text.strip())
-                    if row_text:
-                        text_parts.append(' | '.join(row_text))
-            
-            full_text = '\n'.join(text_parts).strip()
+            # Lecture en flux de word/document.xml, sans le modèle objet python-docx
+            full_text = extract_docx_text(file_content)
             
             if not full_text:
                 raise BaseError("Le fichier DOCX ne contient pas de texte extractible", 400)
@@ -103,12 +117,11 @@ class FileExtractionService:
             BaseError: Si l'extraction échoue
         """
         try:
-            # Essayer UTF-8 d'abord
+            # Encodage de la BOM (UTF-8, UTF-16...), sinon UTF-8 puis latin-1
             try:
-                text = file_content.decode('utf-8')
+                text = decode_text(file_content)
             except UnicodeDecodeError:
-                # Essayer latin-1 si UTF-8 échoue
-                text = file_content.decode('latin-1')
+                raise BaseError("Le fichier texte n'est pas valide dans l'encodage annoncé par sa BOM", 400)
             
             text = text.strip()
             
@@ -122,31 +135,130 @@ class FileExtractionService:
             raise BaseError(f"Erreur lors de la lecture du fichier texte: {str(e)}", 500)
     
     @staticmethod
-    def extract_text_from_file(file_content: bytes, file_extension: str) -> str:
+    def _extract_with(extractor: Callable[[bytes], str], file_content: bytes, label: str) -> str:
         """
-        Extrait le texte d'un fichier selon son extension
+        Exécute un extracteur de document en appliquant la gestion d'erreurs commune
         
         Args:
+            extractor: Fonction d'extraction (contenu binaire -> texte)
             file_content: Contenu binaire du fichier
-            file_extension: Extension du fichier (.pdf, .docx, .txt)
+            label: Nom du format pour les messages d'erreur
             
         Returns:
             Texte extrait
             
         Raises:
-            BaseError: Si le format n'est pas supporté ou si l'extraction échoue
+            BaseError: Si l'extraction échoue ou si le document est vide
+        """
+        try:
+            full_text = extractor(file_content)
+            
+            if not full_text:
+                raise BaseError(f"Le fichier {label} ne contient pas de texte extractible", 400)
+            
+            return full_text
+        except Exception as e:
+            if isinstance(e, BaseError):
+                raise
+            raise BaseError(f"Erreur lors de l'extraction du texte du {label}: {str(e)}", 500)
+    
+    @staticmethod
+    def extract_text_from_odt(file_content: bytes) -> str:
+        """
+        Extrait le texte d'un fichier ODT (OpenDocument)
+        """
+        return FileExtractionService._extract_with(extract_odt_text, file_content, "ODT")
+    
+    @staticmethod
+    def extract_text_from_rtf(file_content: bytes) -> str:
+        """
+        Extrait le texte d'un fichier RTF
+        """
+        return FileExtractionService._extract_with(extract_rtf_text, file_content, "RTF")
+    
+    @staticmethod
+    def extract_text_from_doc(file_content: bytes) -> str:
+        """
+        Extrait le texte d'un fichier DOC (Word 97-2003)
+        """
+        return FileExtractionService._extract_with(extract_doc_text, file_content, "DOC")
+    
+    @staticmethod
+    def extract_text_from_html(file_content: bytes) -> str:
+        """
+        Extrait le texte visible d'un fichier HTML
+        """
+        return FileExtractionService._extract_with(extract_html_text, file_content, "HTML")
+    
+    @staticmethod
+    def detect_file_type(file_content: bytes, file_extension: str = "") -> str:
         """
-        extension = file_extension.lower().lstrip('.')
+        Détermine le type réel du fichier à partir de son contenu (magic bytes)
         
-        if extension == 'pdf':
-            return FileExtractionService.extract_text_from_pdf(file_content)
-        elif extension == 'docx':
-            return FileExtractionService.extract_text_from_docx(file_content)
-        elif extension == 'txt':
-            return FileExtractionService.extract_text_from_txt(file_content)
-        else:
+        Args:
+            file_content: Contenu binaire du fichier
+            file_extension: Extension déclarée (indicative uniquement)
+            
+        Returns:
+            Type de fichier pris en charge par le registre
+            
+        Raises:
+            BaseError: Si le type n'est pas reconnu ou pas supporté
+        """
+        file_type = sniff_file_type(file_content, file_extension)
+        
+        if file_type is None:
+            raise BaseError("Impossible de déterminer le type de fichier", 400)
+        
+        if file_type not in FileExtractionService._extractors:
+            formats = ', '.join(t.upper() for t in FileExtractionService.supported_types())
             raise BaseError(
-                f"Format de fichier non supporté: {extension}. Formats acceptés: PDF, DOCX, TXT",
+                f"Format de fichier non supporté: {file_type}. Formats acceptés: {formats}",
                 400
             )
+        
+        return file_type
+    
+    @staticmethod
+    def extract_document(file_content: bytes, file_extension: str = "") -> Tuple[str, str]:
+        """
+        Détecte le type d'un fichier puis en extrait le texte
+        
+        Args:
+            file_content: Contenu binaire du fichier
+            file_extension: Extension déclarée (indicative uniquement)
+            
+        Returns:
+            Tuple (texte extrait, type détecté)
+            
+        Raises:
+            BaseError: Si le format n'est pas supporté ou si l'extraction échoue
+        """
+        file_type = FileExtractionService.detect_file_type(file_content, file_extension)
+        return FileExtractionService._extractors[file_type](file_content), file_type
+    
+    @staticmethod
+    def extract_text_from_file(file_content: bytes, file_extension: str) -> str:
+        """
+        Extrait le texte d'un fichier selon son type réel
+        
+        Args:
+            file_content: Contenu binaire du fichier
+            file_extension: Extension du fichier (indicative, le contenu fait foi)
+            
+        Returns:
+            Texte extrait
+            
+        Raises:
+            BaseError: Si le format n'est pas supporté ou si l'extraction échoue
+        """
+        return FileExtractionService.extract_document(file_content, file_extension)[0]
+
 
+FileExtractionService.register_extractor("pdf", FileExtractionService.extract_text_from_pdf)
+FileExtractionService.register_extractor("docx", FileExtractionService.extract_text_from_docx)
+FileExtractionService.register_extractor("odt", FileExtractionService.extract_text_from_odt)
+FileExtractionService.register_extractor("doc", FileExtractionService.extract_text_from_doc)
+FileExtractionService.register_extractor("rtf", FileExtractionService.extract_text_from_rtf)
+FileExtractionService.register_extractor("html", FileExtractionService.extract_text_from_html)
+FileExtractionService.register_extractor("txt", FileExtractionService.extract_text_from_txt)
@@ -0,0 +1,139 @@
+"""
+Routeur de modèles : choisit le modèle selon la taille du prompt et la latence observée
+"""
+import time
+from typing import Dict, List, Optional
+from src.Configs.ModelRouter_config import (
+    MODEL_PROFILES,
+    DEFAULT_PROFILE,
+    LONG_PROMPT_TOKENS,
+    SHORT_PROMPT_TOKENS,
+    CHARS_PER_TOKEN,
+    STATS_ALPHA,
+    PRIOR_MS_PER_TOKEN,
+    FAILURES_BEFORE_COOLDOWN,
+    COOLDOWN_SECONDS,
+)
+from src.Utils.Interface.IModels import ChatRequest
+
+
+class _ModelStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.error_rate = 0.0
+        self.latency_ms: Optional[float] = None
+        self.ms_per_token: Optional[float] = None
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 3),
+            "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            "tokens_per_second": round(1000 / self.ms_per_token, 1) if self.ms_per_token else None,
+            "cooling_down": self.cooldown_until > time.monotonic(),
+        }
+
+
+def _ewma(previous: Optional[float], value: float) -> float:
+    return value if previous is None else previous + STATS_ALPHA * (value - previous)
+
+
+class ModelRouter:
+    _stats: Dict[str, _ModelStats] = {}
+
+    @staticmethod
+    def estimate_tokens(request: ChatRequest) -> int:
+        """
+        Estimation du nombre de tokens du prompt (sans tokenizer)
+        """
+        return sum(len(message.content) for message in request.messages) // CHARS_PER_TOKEN
+
+    @staticmethod
+    def _profile(model: str) -> dict:
+        return MODEL_PROFILES.get(model, DEFAULT_PROFILE)
+
+    @staticmethod
+    def _expected_ms_per_token(model: str) -> float:
+        stats = ModelRouter._stats.get(model)
+        if stats is None:
+            return PRIOR_MS_PER_TOKEN
+        # Un modèle qui n'a encore jamais réussi garde la valeur a priori, pénalisée elle aussi par ses erreurs
+        ms_per_token = stats.ms_per_token if stats.ms_per_token is not None else PRIOR_MS_PER_TOKEN
+        return ms_per_token * (1 + 2 * stats.error_rate)
+
+    @staticmethod
+    def rank(request: ChatRequest, models: List[str]) -> List[str]:
+        """
+        Classe les modèles candidats du plus adapté au moins adapté
+
+        - exclut les modèles dont la fenêtre de contexte est trop petite ou en pause après échecs
+        - prompt long : seuls les modèles du meilleur niveau de qualité restant sont retenus
+        - prompt court : les modèles du plus petit niveau (plus rapides) passent en premier
+        - puis tri par débit observé (ms par token généré, pénalisé par le taux d'erreur), à égalité l'ordre de priorité est conservé
+
+        Si aucun modèle n'est éligible, l'ordre de priorité d'origine est conservé.
+        """
+        prompt_tokens = ModelRouter.estimate_tokens(request)
+        needed = prompt_tokens + (request.max_tokens or 0)
+        now = time.monotonic()
+
+        candidates = [
+            model for model in models
+            if ModelRouter._profile(model)["context_window"] >= needed
+            and ModelRouter._stats.get(model, _ModelStats()).cooldown_until <= now
+        ]
+        if not candidates:
+            return list(models)
+
+        if prompt_tokens >= LONG_PROMPT_TOKENS:
+            best_tier = max(ModelRouter._profile(model)["tier"] for model in candidates)
+            preferred = [m for m in candidates if ModelRouter._profile(m)["tier"] == best_tier]
+        elif prompt_tokens < SHORT_PROMPT_TOKENS:
+            smallest_tier = min(ModelRouter._profile(model)["tier"] for model in candidates)
+            preferred = [m for m in candidates if ModelRouter._profile(m)["tier"] == smallest_tier]
+        else:
+            preferred = candidates
+
+        ranked = sorted(preferred, key=ModelRouter._expected_ms_per_token)
+        return ranked + [m for m in models if m not in ranked]
+
+    @staticmethod
+    def select(request: ChatRequest, models: List[str]) -> str:
+        """
+        Retourne le modèle à utiliser : le modèle demandé explicitement, sinon le mieux classé
+        """
+        if request.model:
+            return request.model
+        return ModelRouter.rank(request, models)[0]
+
+    @staticmethod
+    def observe(model: str, latency_ms: float, completion_tokens: Optional[int], ok: bool = True):
+        """
+        Met à jour les statistiques glissantes d'un modèle après un appel
+        """
+        stats = ModelRouter._stats.setdefault(model, _ModelStats())
+        stats.calls += 1
+        stats.error_rate = _ewma(stats.error_rate, 0.0 if ok else 1.0)
+        if not ok:
+            stats.errors += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= FAILURES_BEFORE_COOLDOWN:
+                stats.cooldown_until = time.monotonic() + COOLDOWN_SECONDS
+                stats.consecutive_failures = 0
+            return
+
+        stats.consecutive_failures = 0
+        stats.latency_ms = _ewma(stats.latency_ms, latency_ms)
+        if completion_tokens:
+            stats.ms_per_token = _ewma(stats.ms_per_token, latency_ms / completion_tokens)
+
+    @staticmethod
+    def stats() -> dict:
+        """
+        Statistiques courantes par modèle
+        """
+        return {model: stats.to_dict() for model, stats in ModelRouter._stats.items()}
@@ -0,0 +1,271 @@
+"""
+Service OCR pour les pages PDF sans couche texte (CV scannés)
+"""
+import hashlib
+import logging
+import math
+import multiprocessing
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from src.Configs.OCR_config import (
+    OCR_ENABLED,
+    OCR_LANG,
+    OCR_MAX_WORKERS,
+    OCR_PAGE_TIMEOUT,
+    OCR_DPI,
+    OCR_MAX_DIMENSION,
+    OCR_MAX_PAGES,
+    OCR_CACHE_SIZE,
+)
+from src.Utils.BaseError import BaseError
+from src.Utils.Deadline import check_deadline, deadline_exceeded, remaining, timeout_for, DEADLINE_MESSAGE
+
+try:
+    import pypdfium2 as pdfium
+    import pytesseract
+    from PIL import Image
+except ImportError:  # OCR optionnel : dépendances absentes
+    pdfium = None
+    pytesseract = None
+    Image = None
+
+OCR_POOL_ERROR = "Le service OCR est momentanément indisponible, veuillez réessayer"
+
+
+def _ocr_image(raw: bytes, size: Tuple[int, int], lang: str, timeout: float) -> str:
+    """
+    Exécuté dans un processus du pool : reconnaissance d'une page en niveaux de gris
+    """
+    image = Image.frombytes("L", size, raw)
+    # pytesseract tue le processus tesseract au-delà du délai (RuntimeError)
+    return pytesseract.image_to_string(image, lang=lang, timeout=timeout)
+
+
+class OCRService:
+    _executor: Optional[ProcessPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    # pdfium n'est pas thread-safe : le rendu est sérialisé
+    _render_lock = threading.Lock()
+    _cache: "OrderedDict[str, str]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    _available: Optional[bool] = None
+    # Mode en ligne : OCR exécuté dans le processus courant (déjà un worker)
+    _inline = False
+    # Pages soumises au pool et non terminées (mises à jour depuis plusieurs threads)
+    _pending = 0
+    _pending_lock = threading.Lock()
+
+    @staticmethod
+    def is_available() -> bool:
+        """
+        Indique si l'OCR est activé et utilisable (modules Python et binaire tesseract)
+        """
+        if OCRService._available is None:
+            OCRService._available = bool(
+                OCR_ENABLED
+                and pdfium is not None
+                and pytesseract is not None
+                and shutil.which(pytesseract.pytesseract.tesseract_cmd)
+            )
+            if OCR_ENABLED and not OCRService._available:
+                logging.warning("OCR activé mais indisponible (pypdfium2/pytesseract/tesseract manquant)")
+        return OCRService._available
+
+    @staticmethod
+    def _get_executor() -> ProcessPoolExecutor:
+        with OCRService._executor_lock:
+            if OCRService._executor is None:
+                # spawn : pas de fork d'un processus serveur multi-thread
+                OCRService._executor = ProcessPoolExecutor(
+                    max_workers=OCR_MAX_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return OCRService._executor
+
+    @staticmethod
+    def _reset_executor(executor: ProcessPoolExecutor):
+        """
+        Abandonne un pool cassé (worker tué) : le prochain appel en crée un neuf
+        """
+        with OCRService._executor_lock:
+            if OCRService._executor is executor:
+                OCRService._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def pending() -> int:
+        """
+        Nombre de pages en file ou en cours dans le pool OCR
+        """
+        return OCRService._pending
+
+    @staticmethod
+    def _track(future):
+        with OCRService._pending_lock:
+            OCRService._pending += 1
+        future.add_done_callback(OCRService._untrack)
+
+    @staticmethod
+    def _untrack(_future):
+        with OCRService._pending_lock:
+            OCRService._pending -= 1
+
+    @staticmethod
+    def use_inline():
+        """
+        Exécute l'OCR dans le processus courant, sans pool dédié.
+
+        Utilisé par les workers d'extraction, qui sont déjà des processus bornés.
+        """
+        OCRService._inline = True
+
+    @staticmethod
+    def shutdown():
+        """
+        Arrête le pool de processus OCR
+        """
+        with OCRService._executor_lock:
+            if OCRService._executor is not None:
+                OCRService._executor.shutdown(wait=False, cancel_futures=True)
+                OCRService._executor = None
+
+    @staticmethod
+    def _render_pages(file_content: bytes, page_indices: List[int]) -> List[Tuple[int, bytes, Tuple[int, int]]]:
+        """
+        Rend les pages demandées en niveaux de gris, réduites à OCR_MAX_DIMENSION
+        """
+        rendered = []
+        with OCRService._render_lock:
+            pdf = pdfium.PdfDocument(file_content)
+            try:
+                for index in page_indices:
+                    check_deadline()
+                    page = pdf[index]
+                    try:
+                        image = page.render(scale=OCR_DPI / 72, grayscale=True).to_pil().convert("L")
+                    finally:
+                        page.close()
+                    if max(image.size) > OCR_MAX_DIMENSION:
+                        image.thumbnail((OCR_MAX_DIMENSION, OCR_MAX_DIMENSION))
+                    rendered.append((index, image.tobytes(), image.size))
+            finally:
+                pdf.close()
+        return rendered
+
+    @staticmethod
+    def _cache_get(key: str) -> Optional[str]:
+        with OCRService._cache_lock:
+            text = OCRService._cache.get(key)
+            if text is not None:
+                OCRService._cache.move_to_end(key)
+            return text
+
+    @staticmethod
+    def _cache_set(key: str, text: str):
+        with OCRService._cache_lock:
+            OCRService._cache[key] = text
+            OCRService._cache.move_to_end(key)
+            while len(OCRService._cache) > OCR_CACHE_SIZE:
+                OCRService._cache.popitem(last=False)
+
+    @staticmethod
+    def ocr_pdf_pages(file_content: bytes, page_indices: List[int]) -> Dict[int, str]:
+        """
+        Applique l'OCR aux pages d'un PDF
+
+        Args:
+            file_content: Contenu binaire du fichier PDF
+            page_indices: Index des pages sans couche texte
+
+        Returns:
+            Texte reconnu par index de page (les pages en échec sont absentes)
+
+        L'échéance de la requête borne le rendu, chaque page et l'attente du pool :
+        une fois dépassée, les pages restantes sont abandonnées.
+
+        Raises:
+            BaseError: 503 si le pool de processus OCR est cassé, 504 si l'échéance est dépassée
+        """
+        if len(page_indices) > OCR_MAX_PAGES:
+            logging.warning(f"OCR limité aux {OCR_MAX_PAGES} premières pages sans texte ({len(page_indices)} demandées)")
+            page_indices = page_indices[:OCR_MAX_PAGES]
+
+        results: Dict[int, str] = {}
+        pending = {}
+        for index, raw, size in OCRService._render_pages(file_content, page_indices):
+            key = hashlib.sha256(raw).hexdigest()
+            cached = OCRService._cache_get(key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending[index] = (key, raw, size)
+
+        if not pending:
+            return results
+
+        if OCRService._inline:
+            for index, (key, raw, size) in pending.items():
+                page_timeout = timeout_for(OCR_PAGE_TIMEOUT)
+                try:
+                    text = _ocr_image(raw, size, OCR_LANG, page_timeout)
+                except Exception as e:
+                    logging.warning(f"OCR: échec sur la page {index + 1} ({e})")
+                    continue
+                OCRService._cache_set(key, text)
+                results[index] = text
+            return results
+
+        page_timeout = timeout_for(OCR_PAGE_TIMEOUT)
+        executor = OCRService._get_executor()
+        try:
+            futures = {
+                executor.submit(_ocr_image, raw, size, OCR_LANG, page_timeout): (index, key)
+                for index, (key, raw, size) in pending.items()
+            }
+        except BrokenProcessPool:
+            OCRService._reset_executor(executor)
+            raise BaseError(OCR_POOL_ERROR, 503)
+        for future in futures:
+            OCRService._track(future)
+        # Les pages s'exécutent par vagues de OCR_MAX_WORKERS, chacune bornée par OCR_PAGE_TIMEOUT
+        budget = OCR_PAGE_TIMEOUT * math.ceil(len(futures) / OCR_MAX_WORKERS) + 5
+        left = remaining()
+        if left is not None:
+            budget = min(budget, max(left, 0))
+        done, not_done = wait(futures, timeout=budget)
+
+        broken = False
+        for future in done:
+            index, key = futures[future]
+            try:
+                text = future.result()
+            except BrokenProcessPool:
+                broken = True
+                continue
+            except Exception as e:
+                logging.warning(f"OCR: échec sur la page {index + 1} ({e})")
+                continue
+            OCRService._cache_set(key, text)
+            results[index] = text
+
+        if broken:
+            # Un worker a été tué (mémoire, signal) : le pool est inutilisable, il sera recréé
+            logging.error("OCR: pool de processus cassé, il sera recréé au prochain appel")
+            OCRService._reset_executor(executor)
+            raise BaseError(OCR_POOL_ERROR, 503)
+
+        if not_done and deadline_exceeded():
+            # Échéance atteinte : les pages encore en file ne sont pas lancées pour rien
+            for future in not_done:
+                future.cancel()
+            raise BaseError(DEADLINE_MESSAGE, 504)
+
+        for future in not_done:
+            future.cancel()
+            logging.warning(f"OCR: délai dépassé pour la page {futures[future][0] + 1}")
+
+        return results
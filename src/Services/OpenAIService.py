@@ -1,9 +1,15 @@
+import asyncio
 import os
+import time
 from typing import List, Optional
 from openai import AsyncOpenAI
 from src.Utils.Interface.IModels import ChatMessage, ChatRequest
 from src.Utils.BaseError import BaseError
 from src.Configs.AI_config import PROTECTIVE_SYSTEM_PROMPT
+from src.Services.UsageLedger import UsageLedger
+from src.Services.ModelRouter import ModelRouter
+from src.Configs.Deadline_config import PROVIDER_TIMEOUT_SECONDS
+from src.Utils.Deadline import timeout_for, remaining, deadline_exceeded, DEADLINE_MESSAGE
 
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -34,22 +40,42 @@ class OpenAIService:
                         msg.content = f"{PROTECTIVE_SYSTEM_PROMPT}\n\nContexte additionnel : {msg.content}"
 
         client = OpenAIService._get_client()
+        # Délai borné par l'échéance de la requête ; pas de nouvelle tentative qui la dépasserait
+        timeout = timeout_for(PROVIDER_TIMEOUT_SECONDS)
+        if remaining() is not None:
+            client = client.with_options(max_retries=0)
+        started = time.perf_counter()
         try:
             completion = await client.chat.completions.create(
                 model=OPENAI_MODEL,
                 messages=[{"role": m.role, "content": m.content} for m in request.messages],
                 temperature=request.temperature or 0.7,
                 max_tokens=request.max_tokens or 1000,
+                timeout=timeout,
             )
             content = completion.choices[0].message.content
-            return {
-                "content": content,
-                "model": OPENAI_MODEL,
-                "usage": completion.usage.dict() if hasattr(completion, "usage") else None,
-            }
+            usage = completion.usage.dict() if getattr(completion, "usage", None) else None
+        except asyncio.CancelledError:
+            # Client déconnecté : l'appel est abandonné, sans pénaliser le modèle
+            UsageLedger.record("openai", OPENAI_MODEL, None, (time.perf_counter() - started) * 1000, status="cancelled")
+            raise
         except Exception as e:
+            latency_ms = (time.perf_counter() - started) * 1000
+            UsageLedger.record("openai", OPENAI_MODEL, None, latency_ms, status="error")
+            if deadline_exceeded():
+                raise BaseError(DEADLINE_MESSAGE, 504)
+            ModelRouter.observe(OPENAI_MODEL, latency_ms, None, ok=False)
             raise BaseError(str(e), 503)
 
+        latency_ms = (time.perf_counter() - started) * 1000
+        UsageLedger.record("openai", OPENAI_MODEL, usage, latency_ms)
+        ModelRouter.observe(OPENAI_MODEL, latency_ms, (usage or {}).get("completion_tokens"))
+        return {
+            "content": content,
+            "model": OPENAI_MODEL,
+            "usage": usage,
+        }
+
     @staticmethod
     async def simple_chat(messages: List[ChatMessage], temperature: float = 0.7, max_tokens: int = 1000) -> dict:
         req = ChatRequest(messages=messages, temperature=temperature, max_tokens=max_tokens)
@@ -1,19 +1,27 @@
+import asyncio
 import httpx
 import os
 import logging
+import time
 from typing import List, Optional
 from src.Configs.OpenRouter_config import OPENROUTER_API_KEY, OPENROUTER_API_URL, FREE_MODELS, APP_URL
 from src.Configs.AI_config import PROTECTIVE_SYSTEM_PROMPT
 from src.Utils.BaseError import BaseError
 from src.Utils.Interface.IModels import ChatRequest, ChatMessage
-from src.Services.OpenAIService import OpenAIService
+from src.Services.OpenAIService import OpenAIService, OPENAI_MODEL
+from src.Services.UsageLedger import UsageLedger
+from src.Services.ModelRouter import ModelRouter
+from src.Services.ProfileExtractionService import ProfileExtractionService
+from src.Configs.Deadline_config import PROVIDER_TIMEOUT_SECONDS, MIN_FALLBACK_BUDGET_SECONDS
+from src.Utils.Deadline import timeout_for, remaining, deadline_exceeded, DEADLINE_MESSAGE
 
 
 class OpenRouterService:
     @staticmethod
     async def chat(request: ChatRequest) -> dict:
         """
-        Tente OpenAI (si clé dispo), sinon fallback OpenRouter
+        Utilise le modèle demandé, sinon celui choisi par le routeur parmi OpenAI
+        (si clé dispo) et les modèles gratuits ; fallback OpenRouter si OpenAI échoue
         """
         openai_key = os.getenv("OPENAI_API_KEY")
 
@@ -27,21 +35,28 @@ class OpenRouterService:
                 if msg.role == "system":
                     msg.content = f"{PROTECTIVE_SYSTEM_PROMPT}\n\nContexte additionnel : {msg.content}"
 
-        # 1) Tentative OpenAI si clé présente
-        if openai_key:
+        # Choix du modèle : demande explicite, sinon taille du prompt et latence observée
+        candidates = ([OPENAI_MODEL] if openai_key else []) + FREE_MODELS
+        model = ModelRouter.select(request, candidates)
+
+        # 1) Tentative OpenAI si c'est le modèle retenu
+        if model == OPENAI_MODEL:
             try:
                 return await OpenAIService.chat(request)
             except BaseError as e:
                 logging.warning(f"OpenAI indisponible ({e.message}), fallback OpenRouter")
             except Exception as e:
                 logging.warning(f"OpenAI erreur inattendue ({e}), fallback OpenRouter")
+            # Fallback seulement s'il reste assez de temps pour obtenir une réponse
+            left = remaining()
+            if left is not None and left < MIN_FALLBACK_BUDGET_SECONDS:
+                raise BaseError(f"{DEADLINE_MESSAGE} (temps insuffisant pour le modèle de secours)", 504)
+            model = ModelRouter.rank(request, FREE_MODELS)[0]
 
-        # 2) Fallback OpenRouter
+        # 2) OpenRouter
         if not OPENROUTER_API_KEY:
             raise BaseError("OPENROUTER_API_KEY n'est pas configurée", 500)
 
-        model = request.model or FREE_MODELS[0]
-
         headers = {
             "Authorization": f"Bearer {OPENROUTER_API_KEY}",
             "Content-Type": "application/json",
@@ -56,8 +71,10 @@ class OpenRouterService:
             "max_tokens": request.max_tokens
         }
 
+        timeout = timeout_for(PROVIDER_TIMEOUT_SECONDS)
+        started = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with httpx.AsyncClient(timeout=timeout) as client:
                 response = await client.post(
                     OPENROUTER_API_URL,
                     headers=headers,
@@ -66,27 +83,55 @@ class OpenRouterService:
                 response.raise_for_status()
                 data = response.json()
 
-                return {
+                result = {
                     "content": data["choices"][0]["message"]["content"],
                     "model": data["model"],
                     "usage": data.get("usage")
                 }
+        except asyncio.CancelledError:
+            # Client déconnecté : la connexion au fournisseur est fermée, sans pénaliser le modèle
+            UsageLedger.record("openrouter", model, None, (time.perf_counter() - started) * 1000, status="cancelled")
+            raise
         except httpx.HTTPStatusError as e:
+            latency_ms = (time.perf_counter() - started) * 1000
+            UsageLedger.record("openrouter", model, None, latency_ms, status="error")
+            ModelRouter.observe(model, latency_ms, None, ok=False)
             raise BaseError(
                 f"Erreur OpenRouter: {e.response.text}",
                 e.response.status_code
             )
+        except httpx.TimeoutException:
+            latency_ms = (time.perf_counter() - started) * 1000
+            UsageLedger.record("openrouter", model, None, latency_ms, status="error")
+            if deadline_exceeded():
+                raise BaseError(DEADLINE_MESSAGE, 504)
+            ModelRouter.observe(model, latency_ms, None, ok=False)
+            raise BaseError("Le modèle n'a pas répondu à temps", 504)
         except Exception as e:
+            latency_ms = (time.perf_counter() - started) * 1000
+            UsageLedger.record("openrouter", model, None, latency_ms, status="error")
+            ModelRouter.observe(model, latency_ms, None, ok=False)
             raise BaseError(
                 f"Erreur lors de la communication avec l'IA: {str(e)}",
                 500
             )
 
+        latency_ms = (time.perf_counter() - started) * 1000
+        UsageLedger.record("openrouter", result["model"], result["usage"], latency_ms)
+        ModelRouter.observe(model, latency_ms, (result["usage"] or {}).get("completion_tokens"))
+        return result
+
     @staticmethod
-    async def analyze_cv(cv_text: str, job_description: Optional[str] = None) -> dict:
+    async def analyze_cv(cv_text: str, job_description: Optional[str] = None, compact: bool = False) -> dict:
         """
         Analyse un CV et le compare avec une description de poste
+
+        Avec `compact`, le modèle reçoit le profil extrait localement et les sections
+        utiles du CV plutôt que le texte intégral.
         """
+        if compact:
+            cv_text = ProfileExtractionService.build_compact_cv(cv_text)
+
         system_content = (
             f"{PROTECTIVE_SYSTEM_PROMPT}\n\n"
             "Tu es un expert en recrutement. Analyse les CVs de manière professionnelle et objective."
@@ -0,0 +1,311 @@
+"""
+Extraction locale d'un profil structuré depuis le texte d'un CV
+
+Traitement CPU déterministe (sans appel au modèle) : compétences reconnues par un
+automate d'Aho-Corasick compilé une fois, périodes d'expérience et durée cumulée,
+découpage en sections. Le profil accompagne le texte extrait et sert à construire
+un prompt d'analyse compact.
+"""
+import re
+import unicodedata
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from src.Configs.Skills_config import SKILLS, SECTION_HEADINGS, COMPACT_SECTION_MAX_CHARS
+from src.Utils.AhoCorasick import AhoCorasick
+
+
+def _build_normalization_table() -> dict:
+    # Minuscules sans accents, caractère pour caractère : les positions du texte normalisé
+    # restent celles du texte d'origine
+    table = {ord("’"): "'", ord("‘"): "'", ord(" "): " "}
+    for code in range(0xC0, 0x250):
+        base = unicodedata.normalize("NFKD", chr(code))[0]
+        if base != chr(code) and base.isascii():
+            table[code] = base.lower()
+    return table
+
+
+_NORMALIZATION_TABLE = _build_normalization_table()
+
+
+def normalize(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Quelques majuscules (İ) donnent plusieurs caractères en minuscules : elles sont
+        # laissées telles quelles (la table les ramène à leur lettre de base) pour garder les positions
+        lowered = "".join(char if len(lower := char.lower()) != 1 else lower for char in text)
+    return lowered.translate(_NORMALIZATION_TABLE)
+
+
+def _build_matcher() -> AhoCorasick:
+    matcher = AhoCorasick()
+    for category, skills in SKILLS.items():
+        for name, variants in skills.items():
+            for variant in variants:
+                matcher.add(normalize(variant), (name, category))
+    return matcher.build()
+
+
+_SKILL_MATCHER = _build_matcher()
+
+_HEADINGS = [
+    (section, re.compile(r"^(?:" + "|".join(re.escape(h) for h in headings) + r")\b"))
+    for section, headings in SECTION_HEADINGS.items()
+]
+_HEADING_STRIP = " \t\r:-–—•*#|>."
+_HEADING_MAX_WORDS = 4
+
+_MONTHS = {
+    "janvier": 1, "janv": 1, "jan": 1, "january": 1,
+    "fevrier": 2, "fevr": 2, "fev": 2, "february": 2, "feb": 2,
+    "mars": 3, "march": 3, "mar": 3,
+    "avril": 4, "avr": 4, "april": 4, "apr": 4,
+    "mai": 5, "may": 5,
+    "juin": 6, "june": 6, "jun": 6,
+    "juillet": 7, "juil": 7, "july": 7, "jul": 7,
+    "aout": 8, "august": 8, "aug": 8,
+    "septembre": 9, "sept": 9, "sep": 9, "september": 9,
+    "octobre": 10, "oct": 10, "october": 10,
+    "novembre": 11, "nov": 11, "november": 11,
+    "decembre": 12, "dec": 12, "december": 12,
+}
+_MONTH = "|".join(sorted(_MONTHS, key=len, reverse=True))
+_DATE = rf"(?:(?:{_MONTH})\.?\s+(?:19|20)\d{{2}}|(?:0?[1-9]|1[0-2])\s*[/.-]\s*(?:19|20)\d{{2}}|(?:19|20)\d{{2}})"
+_PRESENT = r"(?:aujourd'hui|aujourd hui|a ce jour|ce jour|present|actuellement|actuel|en cours|now|current|today)"
+_RANGE = re.compile(
+    rf"(?<![\w/.-])(?P<start>{_DATE})(?!\d)\s*(?:-|–|—|a|au|to|until|jusqu'a|jusqu'au|>)\s*(?P<end>{_DATE}|{_PRESENT})(?!\d)"
+)
+_PRESENT_ONLY = re.compile(_PRESENT)
+_SINCE = re.compile(rf"\b(?:depuis|since)\s+(?:le\s+|l')?(?P<start>{_DATE})(?!\d)")
+_DATE_PARTS = re.compile(rf"(?:(?P<month_name>{_MONTH})\.?\s+|(?P<month>\d{{1,2}})\s*[/.-]\s*)?(?P<year>\d{{4}})")
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"(?<![\w+])(?:\+\d{1,3}|0)[\d\s.()-]{7,16}\d")
+# Mois/année ("06.2019") : un numéro n'en contient pas, une plage de dates si
+_MONTH_YEAR = re.compile(r"(?<!\d)(?:0?[1-9]|1[0-2])\s*[/.-]\s*(?:19|20)\d{2}(?!\d)")
+
+# Sections reprises dans le prompt compact (coordonnées et centres d'intérêt omis)
+_COMPACT_SECTIONS = ("summary", "experience", "education", "skills", "certifications", "projects", "languages")
+
+_SECTION_LABELS = {
+    "summary": "Profil",
+    "experience": "Expérience",
+    "education": "Formation",
+    "skills": "Compétences",
+    "certifications": "Certifications",
+    "projects": "Projets",
+    "languages": "Langues",
+}
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _parse_date(value: str, is_end: bool) -> Tuple[int, int]:
+    match = _DATE_PARTS.search(value)
+    year = int(match.group("year"))
+    if match.group("month_name"):
+        month = _MONTHS[match.group("month_name")]
+    elif match.group("month"):
+        month = int(match.group("month"))
+    else:
+        # Année seule : toute l'année en fin de période, son début sinon
+        month = 12 if is_end else 1
+    return year, month
+
+
+def _month_index(year: int, month: int) -> int:
+    return year * 12 + month - 1
+
+
+def _format_month(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class ProfileExtractionService:
+    @staticmethod
+    def find_skills(normalized: str) -> List[dict]:
+        """
+        Compétences du dictionnaire présentes dans le texte normalisé (mots entiers uniquement)
+
+        Les occurrences qui se chevauchent sont résolues au plus à gauche puis au plus long :
+        "node.js" compte Node.js une fois, sans Node.js pour "node" ni JavaScript pour "js".
+        """
+        length = len(normalized)
+        matches = sorted(
+            (start, -end, key)
+            for start, end, key in _SKILL_MATCHER.iter(normalized)
+            if not (start > 0 and _is_word_char(normalized[start - 1]))
+            and not (end < length and _is_word_char(normalized[end]))
+        )
+        counts: Dict[Tuple[str, str], int] = {}
+        covered = 0
+        for start, negative_end, key in matches:
+            if start < covered:
+                continue
+            covered = -negative_end
+            counts[key] = counts.get(key, 0) + 1
+        return [
+            {"name": name, "category": category, "occurrences": occurrences}
+            for (name, category), occurrences in sorted(counts.items(), key=lambda item: (-item[1], item[0][0]))
+        ]
+
+    @staticmethod
+    def split_sections(normalized: str) -> List[dict]:
+        """
+        Découpe le texte en sections d'après les lignes de titre reconnues
+        (la partie précédant le premier titre forme la section "header")
+        """
+        headings = []
+        offset = 0
+        for line in normalized.split("\n"):
+            candidate = line.strip(_HEADING_STRIP)
+            if candidate and len(candidate) <= 50 and len(candidate.split()) <= _HEADING_MAX_WORDS:
+                for section, pattern in _HEADINGS:
+                    if pattern.match(candidate):
+                        headings.append((section, offset, offset + len(line) + 1))
+                        break
+            offset += len(line) + 1
+
+        sections = []
+        first_start = headings[0][1] if headings else len(normalized)
+        if normalized[:first_start].strip():
+            sections.append({"name": "header", "start": 0, "end": first_start})
+        for index, (section, _, body_start) in enumerate(headings):
+            end = headings[index + 1][1] if index + 1 < len(headings) else len(normalized)
+            sections.append({"name": section, "start": min(body_start, end), "end": end})
+        return sections
+
+    @staticmethod
+    def find_periods(text: str, normalized: str, start: int, end: int, today: date) -> List[dict]:
+        """
+        Périodes datées (plages "2019 - 2021", "mars 2020 à aujourd'hui", "depuis 2022"...)
+        entre les positions start et end
+        """
+        current = _month_index(today.year, today.month)
+        periods = []
+        offset = start
+        for line in normalized[start:end].split("\n"):
+            matches = [(m, False) for m in _RANGE.finditer(line)] or [(m, True) for m in _SINCE.finditer(line)]
+            for match, open_ended in matches:
+                first = _month_index(*_parse_date(match.group("start"), is_end=False))
+                end_value = None if open_ended else match.group("end")
+                is_current = end_value is None or _PRESENT_ONLY.fullmatch(end_value) is not None
+                if is_current:
+                    last = current
+                else:
+                    last = min(_month_index(*_parse_date(end_value, is_end=True)), current)
+                months = last - first + 1
+                if months <= 0 or months > 600:
+                    continue
+                periods.append({
+                    "start": _format_month(first),
+                    "end": None if is_current else _format_month(last),
+                    "current": is_current,
+                    "months": months,
+                    "label": text[offset:offset + len(line)].strip()[:160],
+                    "_range": (first, last),
+                })
+            offset += len(line) + 1
+        return periods
+
+    @staticmethod
+    def total_months(periods: List[dict]) -> int:
+        """
+        Durée cumulée en mois, les périodes qui se chevauchent n'étant comptées qu'une fois
+        """
+        total = 0
+        current_start = current_end = None
+        for first, last in sorted(period["_range"] for period in periods):
+            if current_end is not None and first <= current_end + 1:
+                current_end = max(current_end, last)
+                continue
+            if current_end is not None:
+                total += current_end - current_start + 1
+            current_start, current_end = first, last
+        if current_end is not None:
+            total += current_end - current_start + 1
+        return total
+
+    @staticmethod
+    def extract_profile(text: str, today: Optional[date] = None) -> dict:
+        """
+        Construit le profil structuré d'un CV
+
+        Args:
+            text: Texte extrait du CV
+            today: Date de référence pour les périodes en cours (aujourd'hui par défaut)
+
+        Returns:
+            Dictionnaire avec sections, compétences, périodes d'expérience, durée cumulée et contacts
+        """
+        today = today or date.today()
+        normalized = normalize(text)
+        sections = ProfileExtractionService.split_sections(normalized)
+
+        # Les dates de la section expérience font foi ; à défaut, toutes sauf celles de la formation
+        experience = [s for s in sections if s["name"] == "experience"]
+        periods = []
+        for section in experience:
+            periods += ProfileExtractionService.find_periods(text, normalized, section["start"], section["end"], today)
+        if not periods:
+            for section in sections:
+                if section["name"] not in ("education", "certifications", "interests"):
+                    periods += ProfileExtractionService.find_periods(text, normalized, section["start"], section["end"], today)
+
+        total = ProfileExtractionService.total_months(periods)
+        for period in periods:
+            del period["_range"]
+
+        phones = []
+        # Les plages de dates ("06.2019 - 09.2021") ont la forme d'un numéro : elles sont écartées
+        date_spans = [match.span() for match in _RANGE.finditer(normalized)]
+        for match in _PHONE.finditer(text):
+            phone = match.group().strip()
+            start, end = match.span()
+            if any(start < span_end and span_start < end for span_start, span_end in date_spans):
+                continue
+            if _MONTH_YEAR.search(phone):
+                continue
+            digits = sum(char.isdigit() for char in phone)
+            if 9 <= digits <= 15 and phone not in phones:
+                phones.append(phone)
+
+        return {
+            "sections": sections,
+            "skills": ProfileExtractionService.find_skills(normalized),
+            "experiences": periods,
+            "total_experience_months": total,
+            "emails": list(dict.fromkeys(_EMAIL.findall(text))),
+            "phones": phones,
+        }
+
+    @staticmethod
+    def build_compact_cv(text: str, profile: Optional[dict] = None) -> str:
+        """
+        Version compacte d'un CV pour le prompt d'analyse : éléments structurés extraits
+        localement, puis sections utiles tronquées (coordonnées et centres d'intérêt omis).
+        Si aucune section n'est reconnue, le texte est conservé tel quel.
+        """
+        profile = profile or ProfileExtractionService.extract_profile(text)
+        sections = [s for s in profile["sections"] if s["name"] in _COMPACT_SECTIONS]
+        if not sections:
+            return text
+
+        lines = []
+        if profile["skills"]:
+            lines.append("Compétences détectées: " + ", ".join(skill["name"] for skill in profile["skills"]))
+        total = profile["total_experience_months"]
+        if total:
+            lines.append(f"Expérience cumulée: {total // 12} an(s) {total % 12} mois")
+
+        for section in sections:
+            body = text[section["start"]:section["end"]].strip()
+            if not body:
+                continue
+            if len(body) > COMPACT_SECTION_MAX_CHARS:
+                body = body[:COMPACT_SECTION_MAX_CHARS].rsplit(" ", 1)[0] + " […]"
+            lines.append(f"\n## {_SECTION_LABELS[section['name']]}\n{body}")
+
+        return "\n".join(lines)
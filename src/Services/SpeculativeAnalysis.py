@@ -0,0 +1,200 @@
+"""
+Analyse spéculative des CVs : l'analyse est lancée dès l'extraction du texte
+
+Le parcours habituel enchaîne /ai/extract-text puis /ai/analyze-cv sur le même texte.
+L'analyse démarre en tâche de fond à l'extraction ; l'appel à /ai/analyze-cv
+correspondant (même texte, même description de poste) se rattache au résultat en
+cours ou terminé au lieu de relancer le modèle.
+"""
+import asyncio
+import contextvars
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+from src.Configs.AI_config import (
+    SPECULATIVE_ANALYSIS_ENABLED,
+    SPECULATIVE_TTL_SECONDS,
+    SPECULATIVE_MAX_ENTRIES,
+    SPECULATIVE_MAX_IN_FLIGHT,
+)
+from src.Services.OpenRouterService import OpenRouterService
+from src.Services.UsageLedger import UsageLedger
+from src.Utils.Deadline import with_deadline
+from src.Utils.RequestContext import caller_var, feature_var, get_caller
+
+
+def analysis_key(cv_text: str, job_description: Optional[str], compact: bool) -> str:
+    """
+    Identifiant d'une analyse : empreinte du texte, de la description de poste et du mode
+    """
+    digest = hashlib.sha256()
+    for part in (cv_text.strip(), (job_description or "").strip(), "compact" if compact else "full"):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class _Entry:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.created_at = time.monotonic()
+        self.hits = 0
+
+    def expired(self, now: float) -> bool:
+        return now - self.created_at > SPECULATIVE_TTL_SECONDS
+
+
+class SpeculativeAnalysis:
+    _entries: "OrderedDict[str, _Entry]" = OrderedDict()
+    _metrics = {"started": 0, "skipped": 0, "hits": 0, "misses": 0, "failed": 0, "unused": 0}
+
+    @staticmethod
+    def _evict():
+        now = time.monotonic()
+        entries = SpeculativeAnalysis._entries
+        for key in [key for key, entry in entries.items() if entry.expired(now)]:
+            SpeculativeAnalysis._drop(key)
+        while len(entries) > SPECULATIVE_MAX_ENTRIES:
+            SpeculativeAnalysis._drop(next(iter(entries)))
+
+    @staticmethod
+    def _drop(key: str):
+        entry = SpeculativeAnalysis._entries.pop(key)
+        if not entry.hits:
+            SpeculativeAnalysis._metrics["unused"] += 1
+        # Une analyse encore en cours que personne ne réclamera n'a plus de raison d'être facturée
+        if not entry.task.done():
+            entry.task.cancel()
+
+    @staticmethod
+    def _in_flight() -> int:
+        return sum(1 for entry in SpeculativeAnalysis._entries.values() if not entry.task.done())
+
+    @staticmethod
+    def start(cv_text: str, job_description: Optional[str] = None, compact: bool = False) -> Optional[str]:
+        """
+        Lance l'analyse du CV en tâche de fond (si elle n'est pas déjà connue)
+
+        La tâche s'exécute dans un contexte neuf : elle n'hérite ni de l'échéance de la
+        requête d'extraction ni de son annulation si le client se déconnecte.
+
+        Returns:
+            Identifiant de l'analyse, ou None si l'analyse spéculative est désactivée ou saturée
+        """
+        if not SPECULATIVE_ANALYSIS_ENABLED or not cv_text.strip():
+            return None
+
+        SpeculativeAnalysis._evict()
+        key = analysis_key(cv_text, job_description, compact)
+        if key in SpeculativeAnalysis._entries:
+            return key
+        if SpeculativeAnalysis._in_flight() >= SPECULATIVE_MAX_IN_FLIGHT:
+            SpeculativeAnalysis._metrics["skipped"] += 1
+            return None
+
+        context = contextvars.Context()
+        context.run(caller_var.set, get_caller())
+        context.run(feature_var.set, "speculative-analysis")
+        task = asyncio.get_running_loop().create_task(
+            OpenRouterService.analyze_cv(cv_text, job_description, compact),
+            context=context,
+        )
+        task.add_done_callback(lambda done: SpeculativeAnalysis._on_done(key, done))
+        SpeculativeAnalysis._entries[key] = _Entry(task)
+        SpeculativeAnalysis._metrics["started"] += 1
+        return key
+
+    @staticmethod
+    def _on_done(key: str, task: asyncio.Task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            # Échec : l'appel à /ai/analyze-cv refera l'analyse à la demande
+            SpeculativeAnalysis._metrics["failed"] += 1
+            logging.warning(f"Analyse spéculative en échec: {error}")
+            entry = SpeculativeAnalysis._entries.get(key)
+            if entry is not None and entry.task is task:
+                del SpeculativeAnalysis._entries[key]
+
+    @staticmethod
+    async def attach(
+        cv_text: str,
+        job_description: Optional[str] = None,
+        compact: bool = False,
+        handle: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Résultat de l'analyse spéculative correspondante, en attendant sa fin si besoin
+
+        L'attente est protégée : si la requête est annulée ou atteint son échéance,
+        l'analyse continue pour un appel ultérieur.
+
+        Returns:
+            Réponse du modèle (même forme que OpenRouterService.analyze_cv), ou None
+            si aucune analyse n'est disponible (l'appelant lance alors l'analyse)
+        """
+        if not SPECULATIVE_ANALYSIS_ENABLED:
+            return None
+
+        SpeculativeAnalysis._evict()
+        # L'identifiant fourni par le client n'est qu'une indication : seule une analyse du
+        # même texte, de la même description de poste et du même mode est réutilisée
+        key = analysis_key(cv_text, job_description, compact)
+        entry = SpeculativeAnalysis._entries.get(key) if handle in (None, key) else None
+        if entry is None:
+            # Sans identifiant, aucune analyse n'était attendue : ce n'est pas une analyse perdue
+            if handle is not None:
+                SpeculativeAnalysis._metrics["misses"] += 1
+            return None
+
+        started = time.perf_counter()
+        try:
+            result = await with_deadline(asyncio.shield(entry.task))
+        except asyncio.CancelledError:
+            if entry.task.cancelled():
+                SpeculativeAnalysis._metrics["misses"] += 1
+                return None
+            raise
+        except Exception:
+            # Analyse spéculative en échec : repli sur une analyse à la demande (l'échéance reste appliquée par l'appelant)
+            if entry.task.done():
+                SpeculativeAnalysis._metrics["misses"] += 1
+                return None
+            raise
+
+        entry.hits += 1
+        SpeculativeAnalysis._metrics["hits"] += 1
+        UsageLedger.record(
+            "speculative",
+            result.get("model"),
+            None,
+            (time.perf_counter() - started) * 1000,
+            cache_hit=True,
+        )
+        return dict(result)
+
+    @staticmethod
+    def stats() -> dict:
+        """
+        Compteurs de l'analyse spéculative (analyses réutilisées, lancées pour rien...)
+        """
+        metrics = SpeculativeAnalysis._metrics
+        return {
+            "enabled": SPECULATIVE_ANALYSIS_ENABLED,
+            "entries": len(SpeculativeAnalysis._entries),
+            "in_flight": SpeculativeAnalysis._in_flight(),
+            **metrics,
+        }
+
+    @staticmethod
+    def shutdown():
+        """
+        Annule les analyses spéculatives encore en cours
+        """
+        for entry in SpeculativeAnalysis._entries.values():
+            if not entry.task.done():
+                entry.task.cancel()
+        SpeculativeAnalysis._entries.clear()
@@ -0,0 +1,262 @@
+"""
+Comptabilité des appels aux modèles : tokens, latence, modèle, fournisseur et appelant
+
+Les enregistrements sont mis en file sans attente puis écrits par lots dans une
+base SQLite locale par une tâche de fond, hors du chemin des requêtes.
+"""
+import asyncio
+import logging
+import os
+import pathlib
+import sqlite3
+import time
+from typing import List, Optional
+from src.Configs.Usage_config import (
+    USAGE_LEDGER_ENABLED,
+    USAGE_LEDGER_PATH,
+    USAGE_BATCH_SIZE,
+    USAGE_FLUSH_INTERVAL,
+    USAGE_QUEUE_MAX,
+)
+from src.Utils.RequestContext import get_caller, get_feature
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    caller TEXT,
+    feature TEXT,
+    provider TEXT NOT NULL,
+    model TEXT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    total_tokens INTEGER,
+    cached_tokens INTEGER,
+    latency_ms REAL,
+    cache_hit INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_usage_created_at ON llm_usage (created_at);
+"""
+
+_INSERT = (
+    "INSERT INTO llm_usage (created_at, caller, feature, provider, model, prompt_tokens, "
+    "completion_tokens, total_tokens, cached_tokens, latency_ms, cache_hit, status) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Axes d'agrégation autorisés (jamais interpolés depuis l'entrée utilisateur)
+GROUP_BY_COLUMNS = {
+    "model": "model",
+    "provider": "provider",
+    "caller": "caller",
+    "feature": "feature",
+    "status": "status",
+    "day": "date(created_at, 'unixepoch')",
+}
+
+
+class UsageLedger:
+    _queue: Optional[asyncio.Queue] = None
+    _writer: Optional[asyncio.Task] = None
+    _dropped = 0
+
+    @staticmethod
+    def _connect() -> sqlite3.Connection:
+        connection = sqlite3.connect(USAGE_LEDGER_PATH)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    @staticmethod
+    def _connect_readonly() -> sqlite3.Connection:
+        # Lecture seule : une consultation ne crée jamais le fichier de la base
+        uri = f"{pathlib.Path(USAGE_LEDGER_PATH).resolve().as_uri()}?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+
+    @staticmethod
+    def _init_db():
+        connection = UsageLedger._connect()
+        try:
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _write_batch(rows: List[tuple]):
+        connection = UsageLedger._connect()
+        try:
+            with connection:
+                connection.executemany(_INSERT, rows)
+        finally:
+            connection.close()
+
+    @staticmethod
+    async def start():
+        """
+        Crée la base si besoin et démarre la tâche d'écriture en arrière-plan
+        """
+        if not USAGE_LEDGER_ENABLED or UsageLedger._writer is not None:
+            return
+        await asyncio.to_thread(UsageLedger._init_db)
+        UsageLedger._queue = asyncio.Queue(maxsize=USAGE_QUEUE_MAX)
+        UsageLedger._writer = asyncio.create_task(UsageLedger._run_writer())
+
+    @staticmethod
+    async def stop():
+        """
+        Arrête la tâche d'écriture après avoir vidé la file
+        """
+        if UsageLedger._writer is None:
+            return
+        UsageLedger._writer.cancel()
+        try:
+            await UsageLedger._writer
+        except asyncio.CancelledError:
+            pass
+        UsageLedger._writer = None
+        UsageLedger._queue = None
+
+    @staticmethod
+    async def _run_writer():
+        queue = UsageLedger._queue
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch.append(await queue.get())
+                # Regroupe les lignes arrivant dans l'intervalle, jusqu'à USAGE_BATCH_SIZE
+                deadline = loop.time() + USAGE_FLUSH_INTERVAL
+                while len(batch) < USAGE_BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                    except asyncio.TimeoutError:
+                        break
+                flushed, batch = batch, []
+                await UsageLedger._flush(flushed)
+        finally:
+            # Arrêt : écriture synchrone de ce qui reste en file
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                UsageLedger._write_batch(batch)
+
+    @staticmethod
+    async def _flush(batch: List[tuple]):
+        try:
+            await asyncio.to_thread(UsageLedger._write_batch, batch)
+        except Exception as e:
+            logging.warning(f"Registre de consommation: échec d'écriture de {len(batch)} lignes ({e})")
+
+    @staticmethod
+    def record(
+        provider: str,
+        model: Optional[str],
+        usage: Optional[dict],
+        latency_ms: float,
+        status: str = "ok",
+        cache_hit: bool = False,
+    ):
+        """
+        Enregistre un appel de modèle sans bloquer (abandonné si la file est pleine)
+
+        Args:
+            provider: Fournisseur (openai, openrouter, ...)
+            model: Modèle utilisé
+            usage: Dictionnaire `usage` retourné par le fournisseur
+            latency_ms: Durée de l'appel en millisecondes
+            status: "ok", "error", "filtered" (refus local, sans appel au fournisseur)
+                ou "cancelled" (appel abandonné après déconnexion du client)
+            cache_hit: Résultat servi sans nouvel appel au fournisseur
+        """
+        queue = UsageLedger._queue
+        if queue is None:
+            return
+
+        usage = usage or {}
+        details = usage.get("prompt_tokens_details") or {}
+        row = (
+            time.time(),
+            get_caller(),
+            get_feature(),
+            provider,
+            model,
+            usage.get("prompt_tokens"),
+            usage.get("completion_tokens"),
+            usage.get("total_tokens"),
+            details.get("cached_tokens"),
+            round(latency_ms, 1),
+            int(cache_hit),
+            status,
+        )
+        try:
+            queue.put_nowait(row)
+        except asyncio.QueueFull:
+            UsageLedger._dropped += 1
+
+    @staticmethod
+    def _query_summary(group_by: str, since: Optional[float], until: Optional[float]) -> List[dict]:
+        column = GROUP_BY_COLUMNS[group_by]
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        query = (
+            f"SELECT {column} AS key, COUNT(*) AS calls, "
+            "COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens, "
+            "COALESCE(SUM(completion_tokens), 0) AS completion_tokens, "
+            "COALESCE(SUM(total_tokens), 0) AS total_tokens, "
+            "COALESCE(SUM(cached_tokens), 0) AS cached_tokens, "
+            "AVG(latency_ms) AS avg_latency_ms, MAX(latency_ms) AS max_latency_ms, "
+            "SUM(cache_hit) AS cache_hits, "
+            "SUM(CASE WHEN status = 'error' THEN 1 ELSE 0 END) AS errors "
+            f"FROM llm_usage {where} GROUP BY key ORDER BY total_tokens DESC"
+        )
+        connection = UsageLedger._connect_readonly()
+        try:
+            connection.row_factory = sqlite3.Row
+            return [dict(row) for row in connection.execute(query, params)]
+        except sqlite3.OperationalError as e:
+            # Base créée hors de start() sans le schéma : rien n'a encore été enregistré
+            if "no such table" in str(e):
+                return []
+            raise
+        finally:
+            connection.close()
+
+    @staticmethod
+    async def summary(group_by: str = "model", since: Optional[float] = None, until: Optional[float] = None) -> List[dict]:
+        """
+        Agrège la consommation enregistrée par axe (modèle, fournisseur, appelant...)
+
+        Args:
+            group_by: Axe d'agrégation (voir GROUP_BY_COLUMNS)
+            since: Horodatage Unix de début (inclus)
+            until: Horodatage Unix de fin (exclu)
+
+        Returns:
+            Une ligne par valeur de l'axe (vide si le registre est désactivé ou la base absente)
+        """
+        # Le schéma est créé une seule fois par start() : la consultation n'écrit jamais
+        if not USAGE_LEDGER_ENABLED or not os.path.exists(USAGE_LEDGER_PATH):
+            return []
+        return await asyncio.to_thread(UsageLedger._query_summary, group_by, since, until)
+
+    @staticmethod
+    def stats() -> dict:
+        """
+        État du registre (file en attente, enregistrements abandonnés)
+        """
+        queue = UsageLedger._queue
+        return {
+            "enabled": USAGE_LEDGER_ENABLED,
+            "queued": queue.qsize() if queue is not None else 0,
+            "dropped": UsageLedger._dropped,
+        }
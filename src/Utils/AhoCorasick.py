@@ -0,0 +1,58 @@
+"""
+Automate d'Aho-Corasick : recherche simultanée d'un dictionnaire de motifs en un seul passage
+"""
+from collections import deque
+from typing import Any, Iterator, Tuple
+
+
+class AhoCorasick:
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+
+    def add(self, pattern: str, value: Any):
+        """
+        Ajoute un motif ; `value` est restituée à chaque occurrence trouvée
+        """
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append((len(pattern), value))
+
+    def build(self) -> "AhoCorasick":
+        """
+        Calcule les liens d'échec (à appeler une fois tous les motifs ajoutés)
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+        return self
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Itère sur les occurrences (début, fin, valeur), chevauchements compris
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, value in outputs[node]:
+                yield index - length + 1, index + 1, value
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Optional, TypeVar
+from src.Utils.BaseError import BaseError
+
+T = TypeVar("T")
+
+DEADLINE_MESSAGE = "Délai de la requête dépassé"
+
+# Échéance de la requête en cours (horloge monotone), propagée jusqu'aux appels fournisseurs
+deadline_var: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+def remaining() -> Optional[float]:
+    """
+    Temps restant avant l'échéance en secondes (None si la requête n'a pas d'échéance)
+    """
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline():
+    """
+    Raises:
+        BaseError: 504 si l'échéance est dépassée
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise BaseError(DEADLINE_MESSAGE, 504)
+
+
+def timeout_for(default: float) -> float:
+    """
+    Délai à donner à un appel sortant : le défaut, borné par le temps restant
+    """
+    check_deadline()
+    left = remaining()
+    return default if left is None else min(default, left)
+
+
+def deadline_exceeded() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+async def with_deadline(awaitable: Awaitable[T]) -> T:
+    """
+    Attend `awaitable` au plus jusqu'à l'échéance de la requête
+
+    Raises:
+        BaseError: 504 si l'échéance est atteinte avant la fin
+    """
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        else:
+            asyncio.ensure_future(awaitable).cancel()
+        raise BaseError(DEADLINE_MESSAGE, 504)
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        raise BaseError(DEADLINE_MESSAGE, 504)
@@ -0,0 +1,136 @@
+"""
+Détection du type de fichier par signature (magic bytes) plutôt que par extension
+"""
+import codecs
+import io
+import re
+import zipfile
+from typing import Optional
+
+PDF_MAGIC = b"%PDF-"
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_MAGIC = b"PK\x03\x04"
+ODT_MIMETYPE = b"application/vnd.oasis.opendocument.text"
+
+# Marques d'ordre des octets (UTF-32 avant UTF-16 : même préfixe en little-endian)
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Caractères de contrôle tolérés dans un fichier texte, et proportion maximale des autres
+_TEXT_CONTROLS = frozenset("\t\n\r\f\v\x1a")
+MAX_CONTROL_RATIO = 0.05
+
+_HTML_PATTERN = re.compile(rb"<(!doctype\s+html|html|head|body)[\s>]", re.IGNORECASE)
+
+# Types MIME des formats détectés
+MIME_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "odt": "application/vnd.oasis.opendocument.text",
+    "doc": "application/msword",
+    "rtf": "application/rtf",
+    "html": "text/html",
+    "txt": "text/plain",
+    "zip": "application/zip",
+}
+
+
+def sniff_file_type(file_content: bytes, file_extension: str = "") -> Optional[str]:
+    """
+    Détermine le type réel d'un fichier à partir de son contenu
+
+    Args:
+        file_content: Contenu binaire du fichier
+        file_extension: Extension déclarée, utilisée seulement pour départager les formats texte
+
+    Returns:
+        Type détecté (pdf, docx, odt, doc, rtf, html, txt, zip) ou None si binaire inconnu
+    """
+    head = file_content[:1024]
+    extension = file_extension.lower().lstrip(".")
+
+    # Signature en tête (après d'éventuels blancs ou une BOM UTF-8), pas n'importe où dans le début du fichier
+    if head.removeprefix(codecs.BOM_UTF8).lstrip().startswith(PDF_MAGIC):
+        return "pdf"
+    if head.startswith(OLE2_MAGIC):
+        return "doc"
+    if head.lstrip().startswith(b"{\\rtf"):
+        return "rtf"
+    if head.startswith(ZIP_MAGIC):
+        return _sniff_zip(file_content)
+
+    sample = file_content[:4096]
+    encoding = bom_encoding(sample)
+    if encoding is None and b"\x00" in sample:
+        # Octets nuls sans BOM : fichier binaire non reconnu
+        return None
+    try:
+        # Texte avec BOM : l'échantillon doit se décoder dans l'encodage annoncé
+        text = codecs.getincrementaldecoder(encoding or "utf-8")().decode(sample)
+    except UnicodeDecodeError:
+        if encoding is not None:
+            return None
+        text = sample.decode("latin-1")
+    if _looks_binary(text):
+        return None
+    if extension in ("html", "htm") or _HTML_PATTERN.search(text.encode("utf-8")):
+        return "html"
+    return "txt"
+
+
+def _looks_binary(text: str) -> bool:
+    """
+    Proportion de caractères de contrôle (hors tabulations et fins de ligne) trop élevée pour du texte
+    """
+    if not text:
+        return False
+    # Contrôles C0 et DEL seulement : 0x80-0x9F sont des caractères imprimables en cp1252 (’, œ...)
+    controls = sum(1 for char in text if (char < " " or char == "\x7f") and char not in _TEXT_CONTROLS)
+    return controls / len(text) > MAX_CONTROL_RATIO
+
+
+def bom_encoding(file_content: bytes) -> Optional[str]:
+    """
+    Encodage annoncé par la BOM en tête du contenu, ou None s'il n'y en a pas
+    """
+    for bom, encoding in _BOMS:
+        if file_content.startswith(bom):
+            return encoding
+    return None
+
+
+def decode_text(file_content: bytes) -> str:
+    """
+    Décode un fichier texte : encodage de sa BOM s'il en a une, sinon UTF-8 puis latin-1
+
+    Raises:
+        UnicodeDecodeError: Si le contenu n'est pas valide dans l'encodage annoncé par sa BOM
+    """
+    encoding = bom_encoding(file_content)
+    if encoding is not None:
+        return file_content.decode(encoding)
+    try:
+        return file_content.decode("utf-8")
+    except UnicodeDecodeError:
+        return file_content.decode("latin-1")
+
+
+def _sniff_zip(file_content: bytes) -> Optional[str]:
+    """
+    Distingue les formats bureautiques basés sur ZIP d'une archive ordinaire
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+            names = set(archive.namelist())
+            if "word/document.xml" in names:
+                return "docx"
+            if "mimetype" in names and archive.read("mimetype").strip() == ODT_MIMETYPE:
+                return "odt"
+    except zipfile.BadZipFile:
+        return None
+    return "zip"
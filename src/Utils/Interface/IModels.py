@@ -19,7 +19,7 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     """Requête pour une conversation avec l'IA"""
     messages: List[ChatMessage] = Field(..., description="Liste des messages de la conversation")
-    model: Optional[str] = Field(None, description="Modèle IA à utiliser (optionnel, utilise le modèle par défaut si non spécifié)", example="google/gemini-flash-1.5-8b:free")
+    model: Optional[str] = Field(None, description="Modèle IA à utiliser (optionnel, choisi automatiquement selon la taille du prompt et la latence observée si non spécifié)", example="google/gemini-flash-1.5-8b:free")
     temperature: Optional[float] = Field(0.7, description="Température pour la génération (0.0 à 2.0)", ge=0.0, le=2.0)
     max_tokens: Optional[int] = Field(1000, description="Nombre maximum de tokens à générer", ge=1, le=4000)
 
@@ -60,12 +60,15 @@ class AnalyzeCVRequest(BaseModel):
     """Requête pour l'analyse d'un CV"""
     cv_text: str = Field(..., description="Texte du CV à analyser", example="John Doe\nDéveloppeur Full Stack\n5 ans d'expérience en développement web...")
     job_description: Optional[str] = Field(None, description="Description de poste pour une analyse ciblée (optionnel)", example="Nous recherchons un développeur React expérimenté...")
+    compact: bool = Field(False, description="Envoyer au modèle une version compacte du CV (profil extrait localement et sections utiles tronquées)", example=False)
+    analysis_handle: Optional[str] = Field(None, description="Identifiant renvoyé par /ai/extract-text (speculate=true) ; à défaut, l'analyse en cours est retrouvée d'après le texte et la description de poste", example=None)
 
     class Config:
         json_schema_extra = {
             "example": {
                 "cv_text": "John Doe\nDéveloppeur Full Stack\n5 ans d'expérience...",
-                "job_description": "Nous recherchons un développeur React expérimenté..."
+                "job_description": "Nous recherchons un développeur React expérimenté...",
+                "compact": False
             }
         }
 
@@ -88,12 +91,47 @@ class GenerateJobDescriptionRequest(BaseModel):
         }
 
 
+class ProfileSection(BaseModel):
+    """Section reconnue dans le texte d'un CV"""
+    name: str = Field(..., description="Section (header, summary, experience, education, skills, languages...)", example="experience")
+    start: int = Field(..., description="Position de début dans le texte extrait", example=120)
+    end: int = Field(..., description="Position de fin dans le texte extrait", example=860)
+
+
+class SkillMatch(BaseModel):
+    """Compétence reconnue dans un CV"""
+    name: str = Field(..., description="Nom canonique de la compétence", example="React")
+    category: str = Field(..., description="Catégorie de la compétence", example="frameworks")
+    occurrences: int = Field(..., description="Nombre d'occurrences dans le CV", example=3)
+
+
+class ExperiencePeriod(BaseModel):
+    """Période datée trouvée dans un CV"""
+    start: str = Field(..., description="Début (AAAA-MM)", example="2019-03")
+    end: Optional[str] = Field(None, description="Fin (AAAA-MM), absente pour un poste en cours", example="2021-06")
+    current: bool = Field(..., description="Poste en cours", example=False)
+    months: int = Field(..., description="Durée en mois", example=28)
+    label: str = Field(..., description="Ligne du CV contenant la période", example="Mars 2019 – Juin 2021 : Développeur backend chez Acme")
+
+
+class CandidateProfile(BaseModel):
+    """Profil structuré extrait localement d'un CV"""
+    sections: List[ProfileSection] = Field(default_factory=list, description="Sections reconnues")
+    skills: List[SkillMatch] = Field(default_factory=list, description="Compétences reconnues")
+    experiences: List[ExperiencePeriod] = Field(default_factory=list, description="Périodes d'expérience")
+    total_experience_months: int = Field(0, description="Expérience cumulée en mois (chevauchements comptés une fois)", example=64)
+    emails: List[str] = Field(default_factory=list, description="Adresses e-mail", example=["john.doe@mail.com"])
+    phones: List[str] = Field(default_factory=list, description="Numéros de téléphone", example=["+261 34 12 345 67"])
+
+
 class ExtractTextResponse(BaseModel):
     """Réponse pour l'extraction de texte depuis un fichier"""
     text: str = Field(..., description="Texte extrait du fichier", example="John Doe\nDéveloppeur Full Stack\n...")
     file_name: str = Field(..., description="Nom du fichier", example="cv.pdf")
     file_type: str = Field(..., description="Type de fichier", example="pdf")
     character_count: int = Field(..., description="Nombre de caractères extraits", example=1234)
+    profile: Optional[CandidateProfile] = Field(None, description="Profil structuré extrait localement (compétences, expériences, sections)")
+    analysis_handle: Optional[str] = Field(None, description="Identifiant de l'analyse lancée en tâche de fond (speculate=true), à transmettre à /ai/analyze-cv", example=None)
 
     class Config:
         json_schema_extra = {
@@ -101,7 +139,62 @@ class ExtractTextResponse(BaseModel):
                 "text": "John Doe\nDéveloppeur Full Stack\n5 ans d'expérience...",
                 "file_name": "cv.pdf",
                 "file_type": "pdf",
-                "character_count": 1234
+                "character_count": 1234,
+                "profile": {
+                    "sections": [{"name": "experience", "start": 120, "end": 860}],
+                    "skills": [{"name": "React", "category": "frameworks", "occurrences": 3}],
+                    "experiences": [{"start": "2019-03", "end": "2021-06", "current": False, "months": 28, "label": "Mars 2019 – Juin 2021 : Développeur chez Acme"}],
+                    "total_experience_months": 28,
+                    "emails": ["john.doe@mail.com"],
+                    "phones": []
+                }
             }
         }
 
+
+
+class UsageSummaryItem(BaseModel):
+    """Consommation agrégée pour une valeur de l'axe de regroupement"""
+    key: Optional[str] = Field(None, description="Valeur de l'axe (modèle, fournisseur, appelant...)", example="gpt-4o-mini")
+    calls: int = Field(..., description="Nombre d'appels", example=42)
+    prompt_tokens: int = Field(..., description="Tokens de prompt consommés", example=12500)
+    completion_tokens: int = Field(..., description="Tokens générés", example=8300)
+    total_tokens: int = Field(..., description="Total des tokens", example=20800)
+    cached_tokens: int = Field(..., description="Tokens de prompt servis depuis le cache du fournisseur", example=0)
+    avg_latency_ms: Optional[float] = Field(None, description="Latence moyenne (ms)", example=2350.4)
+    max_latency_ms: Optional[float] = Field(None, description="Latence maximale (ms)", example=8120.0)
+    cache_hits: int = Field(..., description="Résultats servis sans nouvel appel au fournisseur", example=3)
+    errors: int = Field(..., description="Appels en échec", example=1)
+
+
+class UsageSummaryResponse(BaseModel):
+    """Réponse de l'agrégation de consommation des modèles"""
+    group_by: str = Field(..., description="Axe de regroupement", example="model")
+    since: Optional[float] = Field(None, description="Début de la période (horodatage Unix)")
+    until: Optional[float] = Field(None, description="Fin de la période (horodatage Unix)")
+    items: List[UsageSummaryItem] = Field(default_factory=list, description="Consommation par valeur de l'axe")
+    ledger: dict = Field(default_factory=dict, description="État du registre (file en attente, lignes abandonnées)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "group_by": "model",
+                "since": 1760000000,
+                "until": None,
+                "items": [
+                    {
+                        "key": "gpt-4o-mini",
+                        "calls": 42,
+                        "prompt_tokens": 12500,
+                        "completion_tokens": 8300,
+                        "total_tokens": 20800,
+                        "cached_tokens": 0,
+                        "avg_latency_ms": 2350.4,
+                        "max_latency_ms": 8120.0,
+                        "cache_hits": 3,
+                        "errors": 1
+                    }
+                ],
+                "ledger": {"enabled": True, "queued": 0, "dropped": 0}
+            }
+        }
@@ -0,0 +1,14 @@
+from contextvars import ContextVar
+from typing import Optional
+
+# Contexte de la requête en cours, propagé jusqu'aux services (comptabilité, etc.)
+caller_var: ContextVar[Optional[str]] = ContextVar("caller", default=None)
+feature_var: ContextVar[Optional[str]] = ContextVar("feature", default=None)
+
+
+def get_caller() -> Optional[str]:
+    return caller_var.get()
+
+
+def get_feature() -> Optional[str]:
+    return feature_var.get()
@@ -0,0 +1,28 @@
+from typing import Optional
+from urllib.parse import quote
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from pydantic import BaseModel
+
+
+def trusted_response(model: BaseModel) -> ORJSONResponse:
+    """
+    Sérialise directement un modèle construit côté serveur.
+
+    Retourner une Response court-circuite la revalidation par `response_model`,
+    qui reste déclaré sur la route pour la documentation OpenAPI.
+    """
+    return ORJSONResponse(content=model.model_dump())
+
+
+def text_response(text: str, file_name: str, file_type: str, analysis_handle: Optional[str] = None) -> PlainTextResponse:
+    """
+    Retourne le texte extrait brut, les métadonnées passant par les en-têtes
+    """
+    headers = {
+        "X-File-Name": quote(file_name),
+        "X-File-Type": file_type,
+        "X-Character-Count": str(len(text)),
+    }
+    if analysis_handle:
+        headers["X-Analysis-Handle"] = analysis_handle
+    return PlainTextResponse(content=text, headers=headers)
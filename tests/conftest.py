@@ -0,0 +1,9 @@
+"""
+Configuration commune des tests : jeton interne et registre de consommation désactivé
+"""
+import os
+
+# Avant tout import de l'application (lus au chargement des modules de configuration)
+os.environ.setdefault("AI_INTERNAL_TOKEN", "test-token")
+os.environ.setdefault("USAGE_LEDGER_ENABLED", "false")
+os.environ.setdefault("OCR_ENABLED", "false")
@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from src.Controllers.AI_controller import AIController
+from src.Middlewares import Admission as admission_module
+from src.Middlewares.Admission import AdmissionController
+from src.Services.ExtractionPool import ExtractionPool
+from src.Services.OCRService import OCRService
+from src.Utils.Interface.IModels import ChatResponse
+
+HEADERS = {"x-internal-token": "test-token"}
+CHAT = {"messages": [{"role": "user", "content": "Bonjour"}]}
+FILE = {"file": ("cv.txt", b"Jean Dupont", "text/plain")}
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset(monkeypatch):
+    monkeypatch.setattr(admission_module, "ADMISSION_ENABLED", True)
+    monkeypatch.setattr(AdmissionController, "_in_flight", {})
+    monkeypatch.setattr(AdmissionController, "_loop_lag_ms", 0.0)
+    monkeypatch.setattr(AdmissionController, "_metrics", {key: 0 for key in AdmissionController._metrics})
+
+    async def chat(request):
+        return ChatResponse(content="Bonjour", model="test")
+
+    monkeypatch.setattr(AIController, "chat", staticmethod(chat))
+
+
+def _assert_shed(response, reason: str):
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(admission_module.RETRY_AFTER_SECONDS)
+    assert response.json()["reason"] == reason
+    assert AdmissionController.state()[f"shed_{reason}"] == 1
+
+
+def test_admitted_request_releases_its_slot():
+    response = client.post("/ai/chat", json=CHAT, headers=HEADERS)
+
+    assert response.status_code == 200
+    assert AdmissionController.state()["in_flight"] == {}
+    assert AdmissionController.state()["admitted"] == 1
+
+
+def test_route_at_its_limit_is_shed():
+    AdmissionController._in_flight["/ai/chat"] = AdmissionController.limit_for("/ai/chat")
+
+    _assert_shed(client.post("/ai/chat", json=CHAT, headers=HEADERS), "in_flight")
+
+
+def test_loop_lag_sheds_requests():
+    AdmissionController._loop_lag_ms = admission_module.MAX_LOOP_LAG_MS + 1
+
+    _assert_shed(client.post("/ai/chat", json=CHAT, headers=HEADERS), "loop_lag")
+
+
+def test_full_extraction_queue_sheds_extractions_only(monkeypatch):
+    monkeypatch.setattr(ExtractionPool, "pending", staticmethod(lambda: admission_module.MAX_EXTRACTION_QUEUE))
+
+    _assert_shed(client.post("/ai/extract-text", files=FILE, headers=HEADERS), "extraction_queue")
+    assert client.post("/ai/chat", json=CHAT, headers=HEADERS).status_code == 200
+
+
+def test_full_ocr_queue_sheds_single_file_extractions(monkeypatch):
+    monkeypatch.setattr(OCRService, "pending", staticmethod(lambda: admission_module.MAX_OCR_QUEUE))
+
+    _assert_shed(client.post("/ai/extract-text", files=FILE, headers=HEADERS), "ocr_queue")
+
+
+def test_health_is_never_shed():
+    AdmissionController._loop_lag_ms = admission_module.MAX_LOOP_LAG_MS + 1
+
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "overloaded"
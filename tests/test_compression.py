@@ -0,0 +1,79 @@
+import asyncio
+import brotli
+import orjson
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from src.Middlewares.Compression import setup_compression
+
+
+def _make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/ai/extract-text/batch")
+    async def batch():
+        async def lines():
+            for index in range(3):
+                yield orjson.dumps({"file_name": f"cv{index}.txt", "text": "x" * 2000}) + b"\n"
+                await asyncio.sleep(0.05)
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/large")
+    async def large():
+        return {"text": "x" * 5000}
+
+    setup_compression(app)
+    return app
+
+
+async def _stream(app, accept_encoding: str):
+    """
+    Appelle l'application ASGI et relève les en-têtes et chaque bloc de corps envoyé
+    """
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": "/ai/extract-text/batch", "raw_path": b"/ai/extract-text/batch", "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+
+    start, chunks = {}, []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message.get("body"):
+            chunks.append(message["body"])
+
+    await app(scope, receive, send)
+    return dict(start["headers"]), chunks
+
+
+def test_ndjson_is_streamed_line_by_line_under_gzip():
+    headers, chunks = asyncio.run(_stream(_make_app(), "gzip, deflate"))
+    assert b"content-encoding" not in headers
+    # Une ligne par bloc : chaque résultat part dès qu'il est prêt
+    assert [orjson.loads(chunk)["file_name"] for chunk in chunks] == ["cv0.txt", "cv1.txt", "cv2.txt"]
+
+
+def test_ndjson_is_streamed_with_brotli():
+    headers, chunks = asyncio.run(_stream(_make_app(), "br, gzip"))
+    assert headers[b"content-encoding"] == b"br"
+    assert len(chunks) >= 3
+    decompressor = brotli.Decompressor()
+    first = decompressor.process(chunks[0])
+    # Le premier bloc se décompresse seul en une ligne complète
+    assert orjson.loads(first)["file_name"] == "cv0.txt"
+
+
+def test_other_routes_are_still_gzipped():
+    client = TestClient(_make_app())
+    response = client.get("/large", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["text"] == "x" * 5000
@@ -0,0 +1,120 @@
+import asyncio
+import orjson
+import pytest
+from main import app
+from src.Controllers.AI_controller import AIController
+from src.Middlewares.Deadline import _timeout_ms
+from src.Configs.Deadline_config import ROUTE_TIMEOUTS_MS
+from src.Utils.Deadline import DEADLINE_MESSAGE
+from src.Utils.Interface.IModels import ChatResponse
+
+BODY = orjson.dumps({"messages": [{"role": "user", "content": "Bonjour"}]})
+
+
+def _scope(path: str, headers: dict) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(key.encode(), value.encode()) for key, value in headers.items()],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+
+
+async def _call(path: str = "/ai/chat", headers: dict = None, disconnect_after: float = None) -> list:
+    """
+    Envoie une requête à l'application ASGI ; le client se déconnecte après `disconnect_after` secondes
+    """
+    headers = {"content-type": "application/json", "x-internal-token": "test-token", **(headers or {})}
+    sent = []
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": BODY, "more_body": False}
+        if disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await asyncio.wait_for(app(_scope(path, headers), receive, send), timeout=5)
+    return sent
+
+
+def _status(sent: list) -> int:
+    return next(message["status"] for message in sent if message["type"] == "http.response.start")
+
+
+def _json(sent: list) -> dict:
+    return orjson.loads(b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body"))
+
+
+@pytest.fixture
+def slow_chat(monkeypatch):
+    state = {"cancelled": False}
+
+    async def chat(request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    monkeypatch.setattr(AIController, "chat", staticmethod(chat))
+    return state
+
+
+def test_disconnect_cancels_handler_without_response(slow_chat):
+    sent = asyncio.run(_call(disconnect_after=0.05))
+
+    assert sent == []
+    assert slow_chat["cancelled"]
+
+
+def test_deadline_returns_504(slow_chat):
+    sent = asyncio.run(_call(headers={"x-request-timeout-ms": "50"}))
+
+    assert _status(sent) == 504
+    assert _json(sent) == {"detail": DEADLINE_MESSAGE}
+    assert slow_chat["cancelled"]
+
+
+def test_handler_ignoring_cancellation_cannot_answer_after_504(monkeypatch):
+    async def chat(request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.05)
+        return ChatResponse(content="trop tard", model="test")
+
+    monkeypatch.setattr(AIController, "chat", staticmethod(chat))
+    sent = asyncio.run(_call(headers={"x-request-timeout-ms": "50"}))
+
+    assert [message["status"] for message in sent if message["type"] == "http.response.start"] == [504]
+    assert _json(sent) == {"detail": DEADLINE_MESSAGE}
+
+
+def test_unauthorized_request_returns_401():
+    sent = asyncio.run(_call(headers={"x-internal-token": "mauvais"}))
+
+    assert _status(sent) == 401
+    assert _json(sent) == {"detail": "Accès IA non autorisé"}
+
+
+@pytest.mark.parametrize("header", ["abc", "0", "-5", ""])
+def test_invalid_timeout_header_uses_route_default(header):
+    scope = _scope("/ai/chat", {"x-request-timeout-ms": header})
+
+    assert _timeout_ms(scope) == ROUTE_TIMEOUTS_MS["/ai/chat"]
@@ -0,0 +1,48 @@
+import codecs
+from src.Utils.FileSniffer import sniff_file_type, decode_text
+
+
+def test_pdf_signature_at_start():
+    assert sniff_file_type(b"%PDF-1.7\n...") == "pdf"
+
+
+def test_pdf_signature_after_whitespace_or_bom():
+    assert sniff_file_type(b"\r\n  %PDF-1.4\n...") == "pdf"
+    assert sniff_file_type(codecs.BOM_UTF8 + b"%PDF-1.4\n...") == "pdf"
+
+
+def test_pdf_signature_inside_text_is_not_a_pdf():
+    content = "Compétences: conversion %PDF-1.4 vers texte\nPython, Django\n".encode("utf-8")
+    assert sniff_file_type(content, ".txt") == "txt"
+
+
+def test_utf16_with_bom_is_text():
+    assert sniff_file_type("Jean Dupont — Développeur".encode("utf-16"), ".txt") == "txt"
+    assert decode_text("Jean Dupont — Développeur".encode("utf-16")) == "Jean Dupont — Développeur"
+
+
+def test_utf16_html_is_html():
+    assert sniff_file_type("<html><body>CV</body></html>".encode("utf-16")) == "html"
+
+
+def test_nul_bytes_without_bom_are_rejected():
+    assert sniff_file_type(b"abc\x00def") is None
+
+
+def test_latin1_text_is_text():
+    assert sniff_file_type("Expérience à Paris, français".encode("latin-1"), ".txt") == "txt"
+
+
+def test_binary_without_nul_bytes_is_rejected():
+    content = bytes(range(1, 256)) * 8
+    assert sniff_file_type(content, ".txt") is None
+
+
+def test_text_with_a_few_control_characters_is_text():
+    content = ("Jean Dupont\tDéveloppeur\r\n" * 40 + "\x0c\x07").encode("utf-8")
+    assert sniff_file_type(content, ".txt") == "txt"
+
+
+def test_cp1252_quotes_are_text():
+    content = "Motivé par l’innovation, j’ai l’habitude d’œuvrer qu’à l’écoute.\n".encode("cp1252") * 20
+    assert sniff_file_type(content, ".txt") == "txt"
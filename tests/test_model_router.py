@@ -0,0 +1,40 @@
+import pytest
+from src.Services import ModelRouter as router_module
+from src.Services.ModelRouter import ModelRouter
+from src.Utils.Interface.IModels import ChatRequest
+
+FAST = "qwen/qwen3-coder:free"  # niveau 2
+LARGE = "nousresearch/hermes-3-llama-3.1-405b:free"  # niveau 3
+LARGE_BIS = "qwen/qwen3-235b-a22b:free"  # niveau 3
+
+
+@pytest.fixture(autouse=True)
+def reset_stats(monkeypatch):
+    monkeypatch.setattr(ModelRouter, "_stats", {})
+    monkeypatch.setattr(router_module, "FAILURES_BEFORE_COOLDOWN", 100)
+
+
+def _request(chars: int) -> ChatRequest:
+    return ChatRequest(messages=[{"role": "user", "content": "x" * chars}])
+
+
+def test_failed_model_without_success_ranks_below_untried_model():
+    ModelRouter.observe(LARGE, 500, None, ok=False)
+    ModelRouter.observe(LARGE, 500, None, ok=False)
+
+    assert ModelRouter.rank(_request(4000), [LARGE, LARGE_BIS])[0] == LARGE_BIS
+
+
+def test_short_prompt_prefers_smaller_model():
+    assert ModelRouter.rank(_request(100), [LARGE, FAST])[0] == FAST
+
+
+def test_long_prompt_prefers_best_tier():
+    assert ModelRouter.rank(_request(10000), [FAST, LARGE])[0] == LARGE
+
+
+def test_medium_prompt_ranks_by_observed_throughput():
+    ModelRouter.observe(FAST, 1000, 10)
+    ModelRouter.observe(LARGE, 1000, 100)
+
+    assert ModelRouter.rank(_request(4000), [FAST, LARGE]) == [LARGE, FAST]
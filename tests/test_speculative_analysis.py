@@ -0,0 +1,39 @@
+import asyncio
+import pytest
+from src.Services import SpeculativeAnalysis as speculative_module
+from src.Services.SpeculativeAnalysis import SpeculativeAnalysis, analysis_key
+from src.Services.OpenRouterService import OpenRouterService
+
+
+@pytest.fixture(autouse=True)
+def reset(monkeypatch):
+    monkeypatch.setattr(speculative_module, "SPECULATIVE_ANALYSIS_ENABLED", True)
+    monkeypatch.setattr(SpeculativeAnalysis, "_entries", type(SpeculativeAnalysis._entries)())
+    monkeypatch.setattr(SpeculativeAnalysis, "_metrics", {key: 0 for key in SpeculativeAnalysis._metrics})
+
+    async def analyze_cv(cv_text, job_description=None, compact=False):
+        return {"content": "Analyse", "model": "test"}
+
+    monkeypatch.setattr(OpenRouterService, "analyze_cv", staticmethod(analyze_cv))
+
+
+def test_request_without_speculation_is_not_a_miss():
+    assert asyncio.run(SpeculativeAnalysis.attach("CV sans extraction préalable")) is None
+    assert SpeculativeAnalysis.stats()["misses"] == 0
+
+
+def test_unknown_handle_is_a_miss():
+    handle = analysis_key("Autre CV", None, False)
+
+    assert asyncio.run(SpeculativeAnalysis.attach("CV", handle=handle)) is None
+    assert SpeculativeAnalysis.stats()["misses"] == 1
+
+
+def test_started_analysis_is_reused():
+    async def scenario():
+        handle = SpeculativeAnalysis.start("Jean Dupont, développeur Python")
+        return await SpeculativeAnalysis.attach("Jean Dupont, développeur Python", handle=handle)
+
+    assert asyncio.run(scenario()) == {"content": "Analyse", "model": "test"}
+    stats = SpeculativeAnalysis.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 0)
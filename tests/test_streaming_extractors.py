@@ -0,0 +1,67 @@
+import io
+import zipfile
+from src.Services.BulkImportService import iter_documents
+from src.Services.Extractors.DocxExtractor import extract_docx_text
+from src.Services.Extractors.XmlStream import XmlStream
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _docx(body: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>')
+    return buffer.getvalue()
+
+
+def _paragraph(text: str) -> str:
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def test_xml_stream_detaches_released_elements():
+    xml = io.BytesIO(b"<root>" + b"<p>ligne</p>" * 1000 + b"</root>")
+    stream = XmlStream(xml)
+    root = None
+    for event, elem in stream:
+        if event == "start" and root is None:
+            root = elem
+        elif event == "end" and elem.tag == "p":
+            stream.release(elem)
+    # Les paragraphes traités ne restent pas attachés à la racine
+    assert len(root) == 0
+
+
+def test_docx_paragraphs_and_tables():
+    table = (
+        "<w:tbl><w:tr>"
+        f"<w:tc>{_paragraph('Python')}</w:tc><w:tc>{_paragraph('5 ans')}</w:tc>"
+        "</w:tr></w:tbl>"
+    )
+    content = _docx(_paragraph("Jean Dupont") + table + _paragraph("Paris"))
+    assert extract_docx_text(content) == "Jean Dupont\nPython | 5 ans\nParis"
+
+
+def test_long_docx_is_read_in_order():
+    content = _docx("".join(_paragraph(f"ligne {index}") for index in range(5000)))
+    lines = extract_docx_text(content).split("\n")
+    assert lines[0] == "ligne 0" and lines[-1] == "ligne 4999" and len(lines) == 5000
+
+
+def test_finished_archive_entries_are_not_read(tmp_path, monkeypatch):
+    path = tmp_path / "historique.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("a.txt", "CV A")
+        archive.writestr("b.txt", "CV B")
+
+    opened = []
+    original_open = zipfile.ZipFile.open
+
+    def tracking_open(self, name, *args, **kwargs):
+        opened.append(getattr(name, "filename", name))
+        return original_open(self, name, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, "open", tracking_open)
+    documents = list(iter_documents(str(path), {"historique.zip!a.txt"}))
+
+    assert documents == [("historique.zip!a.txt", None, ".txt"), ("historique.zip!b.txt", b"CV B", ".txt")]
+    assert opened == ["b.txt"]
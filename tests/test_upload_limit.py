@@ -0,0 +1,56 @@
+from typing import List
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from src.Middlewares.UploadLimit import UploadLimitMiddleware
+
+LIMIT = 4096
+
+
+def _make_client():
+    app = FastAPI()
+    calls = []
+
+    @app.post("/ai/extract-text/batch")
+    async def batch(files: List[UploadFile] = File(...)):
+        calls.append(len(files))
+        return {"files": len(files)}
+
+    app.add_middleware(UploadLimitMiddleware, limits={"/ai/extract-text/batch": LIMIT})
+    return TestClient(app), calls
+
+
+def test_upload_within_limit_is_accepted():
+    client, calls = _make_client()
+    response = client.post("/ai/extract-text/batch", files=[("files", ("cv.txt", b"x" * 1000))])
+    assert response.status_code == 200
+    assert calls == [1]
+
+
+def test_declared_oversized_upload_is_rejected_before_parsing():
+    client, calls = _make_client()
+    response = client.post("/ai/extract-text/batch", files=[("files", ("cv.txt", b"x" * (LIMIT * 2)))])
+    assert response.status_code == 413
+    assert calls == []
+
+
+def test_chunked_oversized_upload_is_cut_off():
+    client, calls = _make_client()
+    boundary = "limite"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"files\"; filename=\"cv.txt\"\r\n\r\n".encode()
+        + b"x" * (LIMIT * 4)
+        + f"\r\n--{boundary}--\r\n".encode()
+    )
+
+    def chunks():
+        for start in range(0, len(body), 1024):
+            yield body[start:start + 1024]
+
+    # Corps envoyé par blocs, sans Content-Length
+    response = client.post(
+        "/ai/extract-text/batch",
+        content=chunks(),
+        headers={"content-type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert response.status_code == 413
+    assert calls == []